@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from agents.base_agent import BaseAgent
 from config.agent_config import get_agent_config
-from utils.code_generator import CodeGenerator
+from utils.code_generator import CodeGenerator, sanitize_project_name
 from utils.project_state import ProjectPhase, ProjectState, Task, TaskStatus
 
 logger = logging.getLogger(__name__)
@@ -270,10 +270,7 @@ class OrchestratorAgent(BaseAgent):
         project = self.project_states[project_id]
         try:
             # Save to {base_output_dir}/{project_name}_{id}/state.json
-            import re
-
-            safe_name = re.sub(r"[^\w\s-]", "", project.project_name.lower())
-            safe_name = re.sub(r"[-\s]+", "_", safe_name)
+            safe_name = sanitize_project_name(project.project_name)
 
             # Use code generator's base path
             base_path = self.code_generator.base_output_dir
@@ -421,16 +421,17 @@ async def store_project_artifacts(project_id: str):
             return
 
         # Store project state as JSON
+        state_dict = project_state.to_dict()
         s3_key = f"projects/{project_id}/project_state.json"
         s3_client.put_object(
             Bucket=S3_BUCKET_NAME,
             Key=s3_key,
-            Body=json.dumps(project_state.to_dict(), indent=2),
+            Body=json.dumps(state_dict, indent=2),
             ContentType="application/json",
         )
 
-        # Store individual artifacts
-        for artifact_name, artifact_data in project_state.artifacts.items():
+        # Store individual artifacts, already decompressed by to_dict
+        for artifact_name, artifact_data in state_dict["artifacts"].items():
             s3_key = f"projects/{project_id}/artifacts/{artifact_name}"
             s3_client.put_object(
                 Bucket=S3_BUCKET_NAME,
@@ -805,11 +806,8 @@ def _get_account_id() -> str:
     return sts_client.get_caller_identity()["Account"]
 
 
-def _get_default_dockerfile(backend_code: Dict[str, Any]) -> str:
-    """Generate a default Dockerfile based on backend code."""
-    framework = backend_code.get("framework", "fastapi").lower()
-
-    return f"""FROM python:3.11-slim
+# Neither template depends on the backend code, so build them once
+_DEFAULT_DOCKERFILE = """FROM python:3.11-slim
 
 WORKDIR /app
 
@@ -831,10 +829,7 @@ HEALTHCHECK --interval=30s --timeout=5s --start-period=60s --retries=3 \\
 CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
 """
 
-
-def _generate_lambda_handler(backend_code: Dict[str, Any]) -> str:
-    """Generate a Lambda handler based on backend code."""
-    return """import json
+_LAMBDA_HANDLER = """import json
 import logging
 
 logger = logging.getLogger()
@@ -880,6 +875,16 @@ def handler(event, context):
 """
 
 
+def _get_default_dockerfile(backend_code: Dict[str, Any]) -> str:
+    """Generate a default Dockerfile based on backend code."""
+    return _DEFAULT_DOCKERFILE
+
+
+def _generate_lambda_handler(backend_code: Dict[str, Any]) -> str:
+    """Generate a Lambda handler based on backend code."""
+    return _LAMBDA_HANDLER
+
+
 # Metrics endpoint for monitoring
 @app.get("/api/v1/metrics")
 async def get_metrics():
@@ -24,6 +24,20 @@ except ImportError:
     # E2E tests don't need agent fixtures
     AGENTS_AVAILABLE = False
 
+# uvloop is optional; async tests fall back to the default loop without it
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
 
 @pytest.fixture
 def mock_anthropic_api():
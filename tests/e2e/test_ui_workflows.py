@@ -13,20 +13,20 @@ from playwright.async_api import async_playwright, expect
 class TestUIWorkflows:
     """End-to-end tests for the UI workflows."""
 
-    @pytest_asyncio.fixture(scope="function")
+    @pytest_asyncio.fixture(scope="function", loop_scope="function")
     async def playwright_instance(self):
         """Create playwright instance for testing."""
         async with async_playwright() as p:
             yield p
 
-    @pytest_asyncio.fixture(scope="function")
+    @pytest_asyncio.fixture(scope="function", loop_scope="function")
     async def browser(self, playwright_instance):
         """Create browser instance for testing."""
         browser = await playwright_instance.chromium.launch(headless=True)
         yield browser
         await browser.close()
 
-    @pytest_asyncio.fixture(scope="function")
+    @pytest_asyncio.fixture(scope="function", loop_scope="function")
     async def page(self, browser):
         """Create a new page for each test."""
         context = await browser.new_context()
@@ -39,7 +39,6 @@ class TestUIWorkflows:
         """URL for the application - can be overridden with E2E_BASE_URL env var."""
         return os.getenv("E2E_BASE_URL", "http://localhost:8000")
 
-    @pytest.mark.asyncio
     async def test_homepage_loads(self, page, app_url):
         """Test that the homepage loads successfully."""
         response = await page.goto(app_url, timeout=30000)
@@ -57,7 +56,6 @@ class TestUIWorkflows:
         title = await page.text_content("h1")
         assert "Multi-Agent" in title or "Agent" in title
 
-    @pytest.mark.asyncio
     async def test_health_endpoint(self, page, app_url):
         """Test that the health check endpoint returns healthy status."""
         response = await page.goto(f"{app_url}/health", timeout=30000)
@@ -67,7 +65,6 @@ class TestUIWorkflows:
         content = await page.content()
         assert "healthy" in content.lower() or "status" in content.lower()
 
-    @pytest.mark.asyncio
     async def test_agent_status_loads(self, page, app_url):
         """Test that agent status section loads without errors."""
         response = await page.goto(app_url, timeout=30000)
@@ -89,7 +86,6 @@ class TestUIWorkflows:
         chat_container = await page.query_selector(".chat-container")
         assert chat_container is not None, "Chat container not found"
 
-    @pytest.mark.asyncio
     async def test_api_docs_accessible(self, page, app_url):
         """Test that the API documentation is accessible."""
         response = await page.goto(f"{app_url}/docs", timeout=30000)
@@ -105,7 +101,6 @@ class TestUIWorkflows:
             or "swagger" in page_content.lower()
         )
 
-    @pytest.mark.asyncio
     async def test_create_project_endpoint(self, page, app_url):
         """Test creating a project via API endpoint - actually creates a project."""
         import httpx
@@ -138,7 +133,6 @@ class TestUIWorkflows:
             assert len(projects) > 0
             assert any(p["name"] == "E2E Test Project" for p in projects)
 
-    @pytest.mark.asyncio
     async def test_list_projects_endpoint(self, page, app_url):
         """Test listing projects via API."""
         try:
@@ -152,7 +146,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not test project listing: {e}")
 
-    @pytest.mark.asyncio
     async def test_metrics_endpoint(self, page, app_url):
         """Test that metrics endpoint returns system metrics."""
         try:
@@ -168,7 +161,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Metrics endpoint not accessible: {e}")
 
-    @pytest.mark.asyncio
     async def test_cors_headers_present(self, page, app_url):
         """Test that CORS headers are properly configured."""
         try:
@@ -181,7 +173,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not verify CORS headers: {e}")
 
-    @pytest.mark.asyncio
     async def test_api_response_times(self, page, app_url):
         """Test that API endpoints respond within acceptable time limits."""
         try:
@@ -199,7 +190,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not measure response times: {e}")
 
-    @pytest.mark.asyncio
     async def test_project_creation_workflow(self, page, app_url):
         """Test complete project creation workflow via API."""
         try:
@@ -240,7 +230,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not complete project creation workflow: {e}")
 
-    @pytest.mark.asyncio
     async def test_error_handling_invalid_project(self, page, app_url):
         """Test API error handling for invalid project ID."""
         try:
@@ -253,7 +242,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not test error handling: {e}")
 
-    @pytest.mark.asyncio
     async def test_concurrent_requests(self, page, app_url):
         """Test that API can handle concurrent requests."""
         try:
@@ -273,7 +261,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not test concurrent requests: {e}")
 
-    @pytest.mark.asyncio
     async def test_api_openapi_spec(self, page, app_url):
         """Test that OpenAPI spec is available and valid."""
         try:
@@ -288,7 +275,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"OpenAPI spec not accessible: {e}")
 
-    @pytest.mark.asyncio
     async def test_redoc_documentation(self, page, app_url):
         """Test that ReDoc documentation is accessible."""
         try:
@@ -303,7 +289,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"ReDoc documentation not accessible: {e}")
 
-    @pytest.mark.asyncio
     async def test_project_tasks_endpoint(self, page, app_url):
         """Test retrieving project tasks."""
         try:
@@ -336,7 +321,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not test tasks endpoint: {e}")
 
-    @pytest.mark.asyncio
     async def test_responsive_design_mobile(self, page, app_url):
         """Test that docs page is responsive on mobile."""
         try:
@@ -351,7 +335,6 @@ class TestUIWorkflows:
         except Exception as e:
             pytest.skip(f"Could not test mobile responsiveness: {e}")
 
-    @pytest.mark.asyncio
     async def test_status_flashing_bug_regression(self, page, app_url):
         """Regression test to ensure status doesn't flash between states."""
         try:
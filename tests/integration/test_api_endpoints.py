@@ -1,22 +1,64 @@
 """Integration tests for API endpoints."""
 
 import asyncio
-import os
-import sys
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, create_autospec, patch
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-
-# Add parent directory to path for imports
-sys.path.insert(
-    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pydantic import ValidationError
+
+from app import DevelopmentRequest, app
+from multi_agent_system import MultiAgentSystem
+
+_STATUS_PAYLOAD = {
+    "status": "ready",
+    "agents_active": 6,
+    "current_task": "System ready",
+    "agents": [
+        {"name": "ProductManager", "status": "ready", "current_task": ""},
+        {"name": "Architect", "status": "ready", "current_task": ""},
+        {"name": "BackendDeveloper", "status": "ready", "current_task": ""},
+        {"name": "QAEngineer", "status": "ready", "current_task": ""},
+        {"name": "DevOpsEngineer", "status": "ready", "current_task": ""},
+        {"name": "DocumentationAgent", "status": "ready", "current_task": ""},
+    ],
+}
+
+_DEVELOP_PAYLOAD = "Successfully processed development request"
+
+# /develop bodies with a missing or wrongly typed field
+_INVALID_DEVELOP_PAYLOADS = [
+    # Missing task description
+    {"requirements": {"project_type": "web_app"}},
+    # Wrong type for task_description (should be string)
+    {"task_description": 123, "requirements": {"project_type": "web"}},
+    # Wrong type for requirements (should be dict)
+    {"task_description": "Build app", "requirements": "not a dict"},
+]
+
+# Pre-serialized /develop body shared by tests posting the same request
+_DEVELOP_BODY = orjson.dumps(
+    {"task_description": "Build app", "requirements": {"project_type": "web"}}
 )
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Autospec'd system shared by the module; async methods become AsyncMocks
+_SYS_SPEC = create_autospec(MultiAgentSystem, instance=True)
+_SYS_SPEC.get_system_status = AsyncMock(return_value=_STATUS_PAYLOAD)
+_SYS_SPEC.process_development_request = AsyncMock(return_value=_DEVELOP_PAYLOAD)
 
-from app import app
+# Large requirements payload, built once at import
+_LARGE_REQ = {
+    "project_type": "enterprise_app",
+    "features": [f"feature{i}" for i in range(100)],
+    "constraints": [f"constraint{i}" for i in range(100)],
+    "description": "x" * 10000,  # 10KB of text
+}
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group(name="api")
 class TestAPIEndpoints:
     """Test cases for API endpoints."""
 
@@ -25,49 +67,29 @@ class TestAPIEndpoints:
         """Create a test client for the FastAPI app."""
         return TestClient(app)
 
+    @pytest.fixture(scope="session")
+    def cors_probe(self):
+        """Response to a single CORS preflight probe, shared by the session.
+
+        CORS middleware configuration is static, so one probe is enough.
+        """
+        response = TestClient(app).options(
+            "/status",
+            headers={
+                "Origin": "http://example.com",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+        return response
+
     @pytest.fixture(autouse=True)
     def mock_system(self):
         """Mock the MultiAgentSystem for testing."""
-        with patch("app.multi_agent_system") as mock_sys:
-            # Mock get_system_status
-            async def mock_get_status():
-                return {
-                    "status": "ready",
-                    "agents_active": 6,
-                    "current_task": "System ready",
-                    "agents": [
-                        {
-                            "name": "ProductManager",
-                            "status": "ready",
-                            "current_task": "",
-                        },
-                        {"name": "Architect", "status": "ready", "current_task": ""},
-                        {
-                            "name": "BackendDeveloper",
-                            "status": "ready",
-                            "current_task": "",
-                        },
-                        {"name": "QAEngineer", "status": "ready", "current_task": ""},
-                        {
-                            "name": "DevOpsEngineer",
-                            "status": "ready",
-                            "current_task": "",
-                        },
-                        {
-                            "name": "DocumentationAgent",
-                            "status": "ready",
-                            "current_task": "",
-                        },
-                    ],
-                }
-
-            # Mock process_development_request
-            async def mock_process_request(task, requirements):
-                return f"Successfully processed: {task}"
-
-            mock_sys.get_system_status = mock_get_status
-            mock_sys.process_development_request = mock_process_request
-            yield mock_sys
+        # Clear side effects installed by error-handling tests
+        _SYS_SPEC.get_system_status.reset_mock(side_effect=True)
+        _SYS_SPEC.process_development_request.reset_mock(side_effect=True)
+        with patch("app.multi_agent_system", _SYS_SPEC):
+            yield _SYS_SPEC
 
     def test_root_endpoint(self, client):
         """Test the root endpoint returns the UI."""
@@ -77,7 +99,7 @@ class TestAPIEndpoints:
         assert "text/html" in response.headers["content-type"]
 
     def test_status_endpoint(self, client):
-        """Test the /status endpoint returns system status."""
+        """Test the /status endpoint returns system status and agent entries."""
         response = client.get("/status")
         assert response.status_code == 200
 
@@ -87,16 +109,9 @@ class TestAPIEndpoints:
         assert "agents" in data
         assert len(data["agents"]) == 6
 
-    def test_status_endpoint_agent_structure(self, client):
-        """Test the structure of agent data in status response."""
-        response = client.get("/status")
-        assert response.status_code == 200
-
-        data = response.json()
+        # Verify the structure of each agent entry
         for agent in data["agents"]:
-            assert "name" in agent
-            assert "status" in agent
-            assert "current_task" in agent
+            assert {"name", "status", "current_task"} <= agent.keys()
 
     def test_develop_endpoint_success(self, client):
         """Test the /develop endpoint with valid request."""
@@ -117,11 +132,16 @@ class TestAPIEndpoints:
         assert data["task"] == "Build a todo list application"
         assert "result" in data
 
-    def test_develop_endpoint_missing_task(self, client):
-        """Test the /develop endpoint with missing task description."""
-        request_data = {"requirements": {"project_type": "web_app"}}
+    @pytest.mark.parametrize("payload", _INVALID_DEVELOP_PAYLOADS)
+    def test_develop_request_validation(self, payload):
+        """Test that invalid /develop payloads are rejected by the request model."""
+        with pytest.raises(ValidationError):
+            DevelopmentRequest.model_validate(payload)
 
-        response = client.post("/develop", json=request_data)
+    @pytest.mark.parametrize("payload", _INVALID_DEVELOP_PAYLOADS)
+    def test_develop_endpoint_rejects_invalid_fields(self, client, payload):
+        """Test that the /develop endpoint answers invalid payloads with 422."""
+        response = client.post("/develop", json=payload)
         assert response.status_code == 422  # Unprocessable Entity
 
     def test_develop_endpoint_missing_requirements(self, client):
@@ -142,22 +162,23 @@ class TestAPIEndpoints:
         response = client.post("/develop", data="invalid json")
         assert response.status_code == 422  # Unprocessable Entity
 
-    def test_cors_headers(self, client):
+    def test_cors_headers(self, cors_probe):
         """Test that CORS headers are properly set."""
-        # Skip CORS test if middleware not configured
-        response = client.get("/status")
-        assert response.status_code == 200
-        # CORS is optional - only check if configured
-        # assert "access-control-allow-origin" in response.headers
+        if "access-control-allow-origin" in cors_probe.headers:
+            assert cors_probe.status_code == 200
+            assert cors_probe.headers["access-control-allow-origin"] in (
+                "*",
+                "http://example.com",
+            )
+        else:
+            # Without CORS middleware the preflight reaches the GET-only route
+            assert cors_probe.status_code == 405
 
     def test_status_endpoint_error_handling(self, client, mock_system):
         """Test error handling in status endpoint."""
 
         # Mock get_system_status to raise an exception
-        async def mock_error():
-            raise Exception("System error")
-
-        mock_system.get_system_status = mock_error
+        mock_system.get_system_status.side_effect = Exception("System error")
 
         # The endpoint should handle the error gracefully
         response = client.get("/status")
@@ -169,25 +190,14 @@ class TestAPIEndpoints:
         """Test error handling in develop endpoint."""
 
         # Mock process_development_request to raise an exception
-        async def mock_error(task, requirements):
-            raise Exception("Processing error")
-
-        mock_system.process_development_request = mock_error
+        mock_system.process_development_request.side_effect = Exception(
+            "Processing error"
+        )
 
-        request_data = {
-            "task_description": "Build app",
-            "requirements": {"project_type": "web"},
-        }
-
-        response = client.post("/develop", json=request_data)
+        response = client.post("/develop", content=_DEVELOP_BODY, headers=_JSON_HEADERS)
         # The actual behavior depends on error handling implementation
         assert response.status_code in [200, 500]
 
-    def test_health_check_endpoint(self, client):
-        """Test if a health check endpoint exists or root can serve as one."""
-        response = client.get("/")
-        assert response.status_code == 200
-
     def test_response_content_types(self, client):
         """Test that endpoints return appropriate content types."""
         # HTML for root
@@ -198,7 +208,6 @@ class TestAPIEndpoints:
         response = client.get("/status")
         assert "application/json" in response.headers["content-type"]
 
-    @pytest.mark.asyncio
     async def test_concurrent_status_requests(self, client):
         """Test handling of concurrent status requests."""
         # Make multiple concurrent requests
@@ -211,18 +220,14 @@ class TestAPIEndpoints:
         for response in tasks:
             assert response.status_code == 200
 
-    @pytest.mark.asyncio
     async def test_concurrent_develop_requests(self, client):
         """Test handling of concurrent development requests."""
-        request_data = {
-            "task_description": "Build app",
-            "requirements": {"project_type": "web"},
-        }
-
         # Make multiple concurrent requests
         tasks = []
         for i in range(5):
-            response = client.post("/develop", json=request_data)
+            response = client.post(
+                "/develop", content=_DEVELOP_BODY, headers=_JSON_HEADERS
+            )
             tasks.append(response)
 
         # All should succeed
@@ -231,36 +236,11 @@ class TestAPIEndpoints:
             data = response.json()
             assert data["status"] == "completed"
 
-    def test_request_validation_types(self, client):
-        """Test type validation for request parameters."""
-        # Wrong type for task_description (should be string)
-        request_data = {
-            "task_description": 123,
-            "requirements": {"project_type": "web"},
-        }
-
-        response = client.post("/develop", json=request_data)
-        assert response.status_code == 422
-
-        # Wrong type for requirements (should be dict)
-        request_data = {"task_description": "Build app", "requirements": "not a dict"}
-
-        response = client.post("/develop", json=request_data)
-        assert response.status_code == 422
-
     def test_large_request_handling(self, client):
         """Test handling of large request payloads."""
-        # Create a large requirements dictionary
-        large_requirements = {
-            "project_type": "enterprise_app",
-            "features": ["feature" + str(i) for i in range(100)],
-            "constraints": ["constraint" + str(i) for i in range(100)],
-            "description": "x" * 10000,  # 10KB of text
-        }
-
         request_data = {
             "task_description": "Build enterprise application",
-            "requirements": large_requirements,
+            "requirements": _LARGE_REQ,
         }
 
         response = client.post("/develop", json=request_data)
@@ -0,0 +1,109 @@
+"""Shared fixtures for unit tests."""
+
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.database import Database
+
+AWS_TEST_REGION = "us-east-1"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _mute_llm_clients():
+    """Replace the Claude client and AutoGen assistant for every unit test."""
+    with patch("agents.base_agent.AnthropicChatCompletionClient"), patch(
+        "agents.base_agent.AssistantAgent"
+    ):
+        yield
+
+
+@pytest.fixture(scope="session")
+def _aws_clients():
+    """Real boto3 clients cached by service name for the session.
+
+    Stubbers intercept every call before it is signed or sent, so no
+    credentials or network access are needed.
+    """
+    # A dedicated session, since tests patch the module-level boto3.client
+    session = boto3.session.Session(region_name=AWS_TEST_REGION)
+    clients = {}
+
+    def get_client(service):
+        if service not in clients:
+            clients[service] = session.client(service)
+        return clients[service]
+
+    return get_client
+
+
+@pytest.fixture
+def aws_stubs(_aws_clients):
+    """Patch cloud_api.boto3.client to hand out botocore-stubbed clients.
+
+    Returns a callable mapping a service name to its active Stubber. Every
+    queued response must be consumed by the end of the test.
+    """
+    stubbers = {}
+
+    def get_stubber(service):
+        if service not in stubbers:
+            stubbers[service] = Stubber(_aws_clients(service))
+            stubbers[service].activate()
+        return stubbers[service]
+
+    def client_factory(service, **kwargs):
+        return get_stubber(service).client
+
+    with patch("cloud_api.boto3.client", side_effect=client_factory):
+        yield get_stubber
+
+    for stubber in stubbers.values():
+        stubber.deactivate()
+        stubber.assert_no_pending_responses()
+
+
+@pytest.fixture(scope="session")
+def _engine():
+    """Create the in-memory test database and its schema once per session."""
+    db = Database("sqlite:///:memory:")
+
+    # pysqlite manages transactions itself and breaks SAVEPOINT handling;
+    # let SQLAlchemy emit BEGIN so nested transactions roll back cleanly.
+    @event.listens_for(db.engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # Durability is irrelevant for a throwaway test database
+    @event.listens_for(db.engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(db.engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    db.create_all()
+    yield db.engine
+    db.engine.dispose()
+
+
+@pytest.fixture
+def test_db(_engine):
+    """Create a test session whose commits are rolled back after the test."""
+    connection = _engine.connect()
+    transaction = connection.begin()
+    # Session commits release SAVEPOINTs inside the outer transaction
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
@@ -1,12 +1,19 @@
 """Unit tests for BaseAgent functionality."""
 
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from agents.base_agent import BaseAgent
 
+# Precomputed Claude responses shared by the async tests
+_MOCK_RESPONSE = Mock()
+_MOCK_RESPONSE.chat_message.content = "Test response from Claude"
+
+_MOCK_CONTEXT_RESPONSE = Mock()
+_MOCK_CONTEXT_RESPONSE.chat_message.content = "Test response with context"
+
 
 class TestBaseAgent:
     """Test cases for BaseAgent class."""
@@ -19,14 +26,11 @@ class TestBaseAgent:
     @pytest.fixture
     def base_agent(self, agent_config):
         """Create a BaseAgent instance for testing."""
-        with patch("agents.base_agent.AnthropicChatCompletionClient"):
-            with patch("agents.base_agent.AssistantAgent"):
-                agent = BaseAgent(
-                    name="TestAgent",
-                    system_prompt="Test system prompt",
-                    llm_config=agent_config,
-                )
-                return agent
+        return BaseAgent(
+            name="TestAgent",
+            system_prompt="Test system prompt",
+            llm_config=agent_config,
+        )
 
     def test_agent_initialization(self, base_agent):
         """Test that agent initializes with correct properties."""
@@ -57,13 +61,10 @@ class TestBaseAgent:
         base_agent.current_task = "Test Task"
         assert base_agent.current_task == "Test Task"
 
-    @pytest.mark.asyncio
     async def test_process_request_async_success(self, base_agent):
         """Test successful async request processing."""
         # Mock the agent response
-        mock_response = Mock()
-        mock_response.chat_message.content = "Test response from Claude"
-        base_agent.agent.on_messages = AsyncMock(return_value=mock_response)
+        base_agent.agent.on_messages = AsyncMock(return_value=_MOCK_RESPONSE)
 
         # Test the request
         result = await base_agent.process_request_async("Test message")
@@ -79,13 +80,10 @@ class TestBaseAgent:
         assert base_agent.conversation_history[0]["request"] == "Test message"
         assert base_agent.conversation_history[0]["response"] == result
 
-    @pytest.mark.asyncio
     async def test_process_request_async_with_context(self, base_agent):
         """Test async request processing with context."""
         # Mock the agent response
-        mock_response = Mock()
-        mock_response.chat_message.content = "Test response with context"
-        base_agent.agent.on_messages = AsyncMock(return_value=mock_response)
+        base_agent.agent.on_messages = AsyncMock(return_value=_MOCK_CONTEXT_RESPONSE)
 
         # Test with context
         context = {"project_name": "Test Project", "task_id": "123"}
@@ -98,7 +96,6 @@ class TestBaseAgent:
         # Verify conversation history includes context
         assert base_agent.conversation_history[0]["context"] == context
 
-    @pytest.mark.asyncio
     async def test_process_request_async_error_handling(self, base_agent):
         """Test error handling in async request processing."""
         # Mock an exception
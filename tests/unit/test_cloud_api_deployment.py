@@ -1,10 +1,12 @@
 """Unit tests for cloud_api AWS deployment functions."""
 
+import copy
 import json
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from botocore.stub import ANY
 
 from cloud_api import (
     _generate_lambda_handler,
@@ -15,10 +17,44 @@ from cloud_api import (
 )
 from utils.project_state import ProjectState
 
-
-@pytest.fixture
-def mock_project_state():
-    """Create a mock project state for testing."""
+ACCOUNT_ID = "123456789012"
+REPOSITORY_URI = f"{ACCOUNT_ID}.dkr.ecr.us-east-1.amazonaws.com/dev-test-application"
+TASK_DEFINITION_ARN = (
+    f"arn:aws:ecs:us-east-1:{ACCOUNT_ID}:task-definition/dev-test-application:1"
+)
+FUNCTION_ARN = f"arn:aws:lambda:us-east-1:{ACCOUNT_ID}:function:dev-test-application"
+BEANSTALK_CNAME = "dev-test-application-env.us-east-1.elasticbeanstalk.com"
+
+# Full expected request parameters, so each stubbed call is checked in one shot
+CREATE_REPOSITORY_PARAMS = {
+    "repositoryName": "dev-test-application",
+    "imageScanningConfiguration": {"scanOnPush": True},
+    "encryptionConfiguration": {"encryptionType": "AES256"},
+}
+TASK_DEFINITION_PARAMS = {
+    "family": "dev-test-application",
+    "networkMode": "awsvpc",
+    "requiresCompatibilities": ["FARGATE"],
+    "cpu": "256",
+    "memory": "512",
+    "containerDefinitions": ANY,
+    "executionRoleArn": f"arn:aws:iam::{ACCOUNT_ID}:role/ecsTaskExecutionRole",
+}
+FUNCTION_CONFIGURATION_PARAMS = {
+    "FunctionName": "dev-test-application",
+    "Runtime": "python3.11",
+    "Role": f"arn:aws:iam::{ACCOUNT_ID}:role/lambda-execution-role",
+    "Handler": "lambda_function.handler",
+    "Environment": ANY,
+    "Timeout": 30,
+    "MemorySize": 512,
+}
+CREATE_FUNCTION_PARAMS = {**FUNCTION_CONFIGURATION_PARAMS, "Code": ANY}
+
+
+@pytest.fixture(scope="module")
+def _project_state_template():
+    """Build the mock project state once per module."""
     state = ProjectState(
         project_id="test-project-123",
         project_name="Test Application",
@@ -33,6 +69,28 @@ def mock_project_state():
 
 
 @pytest.fixture
+def mock_project_state(_project_state_template):
+    """Create a mock project state for testing.
+
+    Deployments write into ``artifacts``, so each test gets its own copy.
+    """
+    return copy.deepcopy(_project_state_template)
+
+
+@pytest.fixture(scope="class")
+def _patch_cloud_api_constants(request):
+    """Patch cloud_api deployment constants once per test class.
+
+    Classes may set an ``environment`` attribute to override the default.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("cloud_api.S3_BUCKET_NAME", "test-bucket")
+        mp.setattr("cloud_api.ENVIRONMENT", getattr(request.cls, "environment", "dev"))
+        mp.setattr("cloud_api.AWS_REGION", "us-east-1")
+        yield
+
+
+@pytest.fixture(scope="module")
 def mock_deployment_config():
     """Mock deployment configuration."""
     return {
@@ -41,7 +99,7 @@ def mock_deployment_config():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_backend_code():
     """Mock backend code configuration."""
     return {
@@ -98,117 +156,42 @@ class TestLambdaHandlerGeneration:
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
+@pytest.mark.usefixtures("_patch_cloud_api_constants")
+@pytest.mark.asyncio(loop_scope="class")
 class TestECSDeployment:
     """Test ECS deployment functionality."""
 
-    @patch("cloud_api.boto3.client")
     @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "dev")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
-    async def test_deploy_to_ecs_creates_repository(
-        self,
-        mock_s3_client,
-        mock_boto_client,
-        mock_project_state,
-        mock_deployment_config,
-        mock_backend_code,
-    ):
-        """Test ECS deployment creates ECR repository."""
-        # Setup mocks
-        mock_ecr = MagicMock()
-        mock_ecs = MagicMock()
-        mock_boto_client.side_effect = lambda service, **kwargs: (
-            mock_ecr if service == "ecr" else mock_ecs
-        )
-
-        mock_ecr.create_repository.return_value = {
-            "repository": {
-                "repositoryUri": "123456789012.dkr.ecr.us-east-1.amazonaws.com/dev-test-application"
-            }
-        }
-        mock_ecs.register_task_definition.return_value = {
-            "taskDefinition": {
-                "taskDefinitionArn": "arn:aws:ecs:us-east-1:123456789012:task-definition/dev-test-application:1"
-            }
-        }
-
-        with patch("cloud_api._get_account_id", return_value="123456789012"):
-            await deploy_to_ecs(
-                "test-project-123",
-                mock_project_state,
-                mock_deployment_config,
-                mock_backend_code,
-            )
-
-        # Verify ECR repository creation
-        mock_ecr.create_repository.assert_called_once()
-        call_args = mock_ecr.create_repository.call_args
-        assert call_args[1]["repositoryName"] == "dev-test-application"
-        assert call_args[1]["imageScanningConfiguration"]["scanOnPush"] is True
-
-        # Verify task definition registration
-        mock_ecs.register_task_definition.assert_called_once()
-        task_def = mock_ecs.register_task_definition.call_args[1]
-        assert task_def["family"] == "dev-test-application"
-        assert task_def["requiresCompatibilities"] == ["FARGATE"]
-        assert task_def["cpu"] == "256"
-        assert task_def["memory"] == "512"
-
-        # Verify deployment info stored in project state
-        assert "aws_deployment" in mock_project_state.artifacts
-        deployment_info = mock_project_state.artifacts["aws_deployment"]
-        assert deployment_info["deployment_type"] == "ecs"
-        assert "repository_uri" in deployment_info
-        assert "task_definition_arn" in deployment_info
-
-    @patch("cloud_api.boto3.client")
-    @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "dev")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
     async def test_deploy_to_ecs_uses_existing_repository(
         self,
         mock_s3_client,
-        mock_boto_client,
+        aws_stubs,
         mock_project_state,
         mock_deployment_config,
         mock_backend_code,
     ):
         """Test ECS deployment uses existing ECR repository."""
-        mock_ecr = MagicMock()
-        mock_ecs = MagicMock()
-        mock_boto_client.side_effect = lambda service, **kwargs: (
-            mock_ecr if service == "ecr" else mock_ecs
+        ecr_stub = aws_stubs("ecr")
+
+        # Simulate repository already exists, then describe the existing repo
+        ecr_stub.add_client_error(
+            "create_repository",
+            service_error_code="RepositoryAlreadyExistsException",
+            service_message="Repository already exists",
+            expected_params=CREATE_REPOSITORY_PARAMS,
         )
-
-        # Create a proper exception class
-        class RepositoryAlreadyExistsException(Exception):
-            pass
-
-        mock_ecr.exceptions.RepositoryAlreadyExistsException = (
-            RepositoryAlreadyExistsException
+        ecr_stub.add_response(
+            "describe_repositories",
+            {"repositories": [{"repositoryUri": REPOSITORY_URI}]},
+            expected_params={"repositoryNames": ["dev-test-application"]},
         )
-
-        # Simulate repository already exists
-        mock_ecr.create_repository.side_effect = RepositoryAlreadyExistsException(
-            "Repository already exists"
+        aws_stubs("ecs").add_response(
+            "register_task_definition",
+            {"taskDefinition": {"taskDefinitionArn": TASK_DEFINITION_ARN}},
+            expected_params=TASK_DEFINITION_PARAMS,
         )
-        mock_ecr.describe_repositories.return_value = {
-            "repositories": [
-                {
-                    "repositoryUri": "123456789012.dkr.ecr.us-east-1.amazonaws.com/dev-test-application"
-                }
-            ]
-        }
-        mock_ecs.register_task_definition.return_value = {
-            "taskDefinition": {
-                "taskDefinitionArn": "arn:aws:ecs:us-east-1:123456789012:task-definition/dev-test-application:1"
-            }
-        }
-
-        with patch("cloud_api._get_account_id", return_value="123456789012"):
+
+        with patch("cloud_api._get_account_id", return_value=ACCOUNT_ID):
             await deploy_to_ecs(
                 "test-project-123",
                 mock_project_state,
@@ -216,40 +199,42 @@ class TestECSDeployment:
                 mock_backend_code,
             )
 
-        # Verify it tried to create and then described existing repo
-        mock_ecr.create_repository.assert_called_once()
-        mock_ecr.describe_repositories.assert_called_once_with(
-            repositoryNames=["dev-test-application"]
-        )
+        deployment_info = mock_project_state.artifacts["aws_deployment"]
+        assert deployment_info["repository_uri"] == REPOSITORY_URI
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
+@pytest.mark.usefixtures("_patch_cloud_api_constants")
+@pytest.mark.asyncio(loop_scope="class")
 class TestLambdaDeployment:
     """Test Lambda deployment functionality."""
 
-    @patch("cloud_api.boto3.client")
     @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "dev")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
-    async def test_deploy_to_lambda_creates_function(
+    async def test_deploy_to_lambda_updates_existing_function(
         self,
         mock_s3_client,
-        mock_boto_client,
+        aws_stubs,
         mock_project_state,
         mock_deployment_config,
         mock_backend_code,
     ):
-        """Test Lambda deployment creates function."""
-        mock_lambda = MagicMock()
-        mock_boto_client.return_value = mock_lambda
+        """Test Lambda deployment updates existing function."""
+        lambda_stub = aws_stubs("lambda")
 
-        mock_lambda.create_function.return_value = {
-            "FunctionArn": "arn:aws:lambda:us-east-1:123456789012:function:dev-test-application"
-        }
+        # Simulate function already exists
+        lambda_stub.add_client_error(
+            "create_function",
+            service_error_code="ResourceConflictException",
+            service_message="Function already exists",
+            expected_params=CREATE_FUNCTION_PARAMS,
+        )
+        lambda_stub.add_response(
+            "update_function_configuration",
+            {"FunctionArn": FUNCTION_ARN},
+            expected_params=FUNCTION_CONFIGURATION_PARAMS,
+        )
 
-        with patch("cloud_api._get_account_id", return_value="123456789012"):
+        with patch("cloud_api._get_account_id", return_value=ACCOUNT_ID):
             await deploy_to_lambda(
                 "test-project-123",
                 mock_project_state,
@@ -257,140 +242,167 @@ class TestLambdaDeployment:
                 mock_backend_code,
             )
 
-        # Verify Lambda function creation
-        mock_lambda.create_function.assert_called_once()
-        call_args = mock_lambda.create_function.call_args[1]
-        assert call_args["FunctionName"] == "dev-test-application"
-        assert call_args["Runtime"] == "python3.11"
-        assert call_args["Handler"] == "lambda_function.handler"
-        assert call_args["Timeout"] == 30
-        assert call_args["MemorySize"] == 512
-
-        # Verify deployment info stored
-        assert "aws_deployment" in mock_project_state.artifacts
         deployment_info = mock_project_state.artifacts["aws_deployment"]
-        assert deployment_info["deployment_type"] == "lambda"
-        assert "function_arn" in deployment_info
+        assert deployment_info["function_arn"] == FUNCTION_ARN
 
-    @patch("cloud_api.boto3.client")
-    @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "dev")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
-    async def test_deploy_to_lambda_updates_existing_function(
-        self,
-        mock_s3_client,
-        mock_boto_client,
-        mock_project_state,
-        mock_deployment_config,
-        mock_backend_code,
-    ):
-        """Test Lambda deployment updates existing function."""
-        mock_lambda = MagicMock()
-        mock_boto_client.return_value = mock_lambda
 
-        # Create a proper exception class
-        class ResourceConflictException(Exception):
-            pass
+def _stub_ecs(aws_stubs):
+    """Queue the ECR and ECS calls made by a fresh deploy_to_ecs."""
+    aws_stubs("ecr").add_response(
+        "create_repository",
+        {"repository": {"repositoryUri": REPOSITORY_URI}},
+        expected_params=CREATE_REPOSITORY_PARAMS,
+    )
+    aws_stubs("ecs").add_response(
+        "register_task_definition",
+        {"taskDefinition": {"taskDefinitionArn": TASK_DEFINITION_ARN}},
+        expected_params=TASK_DEFINITION_PARAMS,
+    )
 
-        mock_lambda.exceptions.ResourceConflictException = ResourceConflictException
 
-        # Simulate function already exists
-        mock_lambda.create_function.side_effect = ResourceConflictException(
-            "Function already exists"
-        )
-        mock_lambda.update_function_configuration.return_value = {
-            "FunctionArn": "arn:aws:lambda:us-east-1:123456789012:function:dev-test-application"
-        }
+def _stub_lambda(aws_stubs):
+    """Queue the Lambda call made by a fresh deploy_to_lambda."""
+    aws_stubs("lambda").add_response(
+        "create_function",
+        {"FunctionArn": FUNCTION_ARN},
+        expected_params=CREATE_FUNCTION_PARAMS,
+    )
 
-        with patch("cloud_api._get_account_id", return_value="123456789012"):
-            await deploy_to_lambda(
-                "test-project-123",
-                mock_project_state,
-                mock_deployment_config,
-                mock_backend_code,
-            )
 
-        # Verify update was called
-        mock_lambda.update_function_configuration.assert_called_once()
-        call_args = mock_lambda.update_function_configuration.call_args[1]
-        assert call_args["FunctionName"] == "dev-test-application"
+def _stub_beanstalk(aws_stubs, environment, environment_type, cname):
+    """Queue the Elastic Beanstalk calls made by deploy_to_beanstalk."""
+    app_name = f"{environment}-test-application"
+    eb_stub = aws_stubs("elasticbeanstalk")
+    eb_stub.add_response(
+        "create_application",
+        {},
+        expected_params={
+            "ApplicationName": app_name,
+            "Description": ANY,
+        },
+    )
+    eb_stub.add_response(
+        "create_application_version",
+        {},
+        expected_params={
+            "ApplicationName": app_name,
+            "VersionLabel": ANY,
+            "SourceBundle": ANY,
+            "AutoCreateApplication": False,
+        },
+    )
+    eb_stub.add_response(
+        "create_environment",
+        {"CNAME": cname},
+        expected_params={
+            "ApplicationName": app_name,
+            "EnvironmentName": f"{app_name}-env",
+            "VersionLabel": ANY,
+            "SolutionStackName": ANY,
+            "OptionSettings": [
+                {
+                    "Namespace": "aws:elasticbeanstalk:environment",
+                    "OptionName": "EnvironmentType",
+                    "Value": environment_type,
+                },
+                {
+                    "Namespace": "aws:elasticbeanstalk:application:environment",
+                    "OptionName": "ENVIRONMENT",
+                    "Value": environment,
+                },
+            ],
+        },
+    )
+    return eb_stub
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-class TestBeanstalkDeployment:
-    """Test Elastic Beanstalk deployment functionality."""
-
-    @patch("cloud_api.boto3.client")
+@pytest.mark.usefixtures("_patch_cloud_api_constants")
+@pytest.mark.asyncio(loop_scope="class")
+class TestDeploymentCreatesResources:
+    """Test each deployment target provisions fresh resources."""
+
+    @pytest.mark.parametrize(
+        "deploy_fn,stub_fn,expected_type,expected_info",
+        [
+            (
+                deploy_to_ecs,
+                _stub_ecs,
+                "ecs",
+                {
+                    "repository_uri": REPOSITORY_URI,
+                    "task_definition_arn": TASK_DEFINITION_ARN,
+                },
+            ),
+            (
+                deploy_to_lambda,
+                _stub_lambda,
+                "lambda",
+                {"function_arn": FUNCTION_ARN},
+            ),
+            (
+                deploy_to_beanstalk,
+                lambda stubs: _stub_beanstalk(
+                    stubs, "dev", "SingleInstance", BEANSTALK_CNAME
+                ),
+                "beanstalk",
+                {"environment_url": f"http://{BEANSTALK_CNAME}"},
+            ),
+        ],
+        ids=["ecs", "lambda", "beanstalk"],
+    )
     @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "dev")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
-    async def test_deploy_to_beanstalk_creates_application(
+    async def test_deploy_creates_resources(
         self,
         mock_s3_client,
-        mock_boto_client,
+        deploy_fn,
+        stub_fn,
+        expected_type,
+        expected_info,
+        aws_stubs,
         mock_project_state,
         mock_deployment_config,
         mock_backend_code,
     ):
-        """Test Beanstalk deployment creates application."""
-        mock_eb = MagicMock()
-        mock_boto_client.return_value = mock_eb
+        """Test deployment provisions resources and records them."""
+        stub_fn(aws_stubs)
 
-        mock_eb.create_environment.return_value = {
-            "CNAME": "dev-test-application-env.us-east-1.elasticbeanstalk.com"
-        }
-
-        await deploy_to_beanstalk(
-            "test-project-123",
-            mock_project_state,
-            mock_deployment_config,
-            mock_backend_code,
-        )
+        with patch("cloud_api._get_account_id", return_value=ACCOUNT_ID):
+            await deploy_fn(
+                "test-project-123",
+                mock_project_state,
+                mock_deployment_config,
+                mock_backend_code,
+            )
 
-        # Verify application creation
-        mock_eb.create_application.assert_called_once()
-        call_args = mock_eb.create_application.call_args[1]
-        assert call_args["ApplicationName"] == "dev-test-application"
+        # Verify deployment info stored in project state
+        deployment_info = mock_project_state.artifacts["aws_deployment"]
+        assert deployment_info["deployment_type"] == expected_type
+        for key, value in expected_info.items():
+            assert deployment_info[key] == value
 
-        # Verify application version creation
-        mock_eb.create_application_version.assert_called_once()
 
-        # Verify environment creation
-        mock_eb.create_environment.assert_called_once()
-        env_args = mock_eb.create_environment.call_args[1]
-        assert env_args["ApplicationName"] == "dev-test-application"
-        assert env_args["EnvironmentName"] == "dev-test-application-env"
+@pytest.mark.unit
+@pytest.mark.usefixtures("_patch_cloud_api_constants")
+@pytest.mark.asyncio(loop_scope="class")
+class TestBeanstalkProdDeployment:
+    """Test Elastic Beanstalk deployment in the production environment."""
 
-        # Verify deployment info stored
-        assert "aws_deployment" in mock_project_state.artifacts
-        deployment_info = mock_project_state.artifacts["aws_deployment"]
-        assert deployment_info["deployment_type"] == "beanstalk"
-        assert "environment_url" in deployment_info
-        assert deployment_info["environment_url"].startswith("http://")
+    environment = "prod"
 
-    @patch("cloud_api.boto3.client")
     @patch("cloud_api.s3_client")
-    @patch("cloud_api.S3_BUCKET_NAME", "test-bucket")
-    @patch("cloud_api.ENVIRONMENT", "prod")
-    @patch("cloud_api.AWS_REGION", "us-east-1")
     async def test_deploy_to_beanstalk_prod_uses_load_balanced(
         self,
         mock_s3_client,
-        mock_boto_client,
+        aws_stubs,
         mock_project_state,
         mock_deployment_config,
         mock_backend_code,
     ):
         """Test Beanstalk deployment uses LoadBalanced for production."""
-        mock_eb = MagicMock()
-        mock_boto_client.return_value = mock_eb
-
-        mock_eb.create_environment.return_value = {
-            "CNAME": "test-app.elasticbeanstalk.com"
-        }
+        _stub_beanstalk(
+            aws_stubs, "prod", "LoadBalanced", "test-app.elasticbeanstalk.com"
+        )
 
         await deploy_to_beanstalk(
             "test-project-123",
@@ -398,12 +410,3 @@ class TestBeanstalkDeployment:
             mock_deployment_config,
             mock_backend_code,
         )
-
-        # Check that LoadBalanced is used for prod
-        env_args = mock_eb.create_environment.call_args[1]
-        option_settings = env_args["OptionSettings"]
-        env_type_setting = next(
-            (s for s in option_settings if s["OptionName"] == "EnvironmentType"), None
-        )
-        assert env_type_setting is not None
-        assert env_type_setting["Value"] == "LoadBalanced"
@@ -1,23 +1,28 @@
 """Unit tests for the CodeGenerator utility."""
 
+import re
+import shutil
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from utils import code_generator as code_generator_module
 from utils.code_generator import CodeGenerator
+from utils.project_template import generate_fastapi_project
 
 
 class TestCodeGenerator:
     """Test suite for CodeGenerator class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def temp_dir(self):
-        """Create a temporary directory for testing."""
+        """Create a temporary directory shared by the module."""
         with tempfile.TemporaryDirectory() as tmpdir:
             yield tmpdir
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def code_generator(self, temp_dir):
         """Create a CodeGenerator instance with temp directory."""
         return CodeGenerator(base_output_dir=temp_dir)
@@ -33,49 +38,100 @@ class TestCodeGenerator:
         assert project_dir.is_dir()
         assert "test_project" in str(project_dir)
 
-    def test_extract_code_blocks_pattern1(self, code_generator):
-        """Test extracting code blocks with pattern: ```language:filename"""
-        text = """
+    def test_create_project_directory_skips_known_dirs(self, tmp_path):
+        """Test that a repeated call does not mkdir the same directory again."""
+        generator = CodeGenerator(base_output_dir=str(tmp_path))
+        first = generator.create_project_directory("repeat-123", "Repeat Project")
+
+        with patch.object(Path, "mkdir") as mkdir:
+            second = generator.create_project_directory("repeat-123", "Repeat Project")
+
+        assert second == first
+        mkdir.assert_not_called()
+
+    def test_create_project_directory_recreates_deleted_dir(self, tmp_path):
+        """Test that a known directory is created again after being removed."""
+        generator = CodeGenerator(base_output_dir=str(tmp_path))
+        first = generator.create_project_directory("gone-123", "Gone Project")
+        shutil.rmtree(first)
+
+        second = generator.create_project_directory("gone-123", "Gone Project")
+
+        assert second == first
+        assert second.is_dir()
+
+    @pytest.mark.parametrize(
+        "text, filename, needle",
+        [
+            # Pattern 1: ```language:filename
+            (
+                """
         Here is a file:
         ```python:main.py
         print("Hello World")
         ```
-        """
-
-        files = code_generator.extract_code_blocks(text)
-
-        assert "main.py" in files
-        assert 'print("Hello World")' in files["main.py"]
-
-    def test_extract_code_blocks_pattern2(self, code_generator):
-        """Test extracting code blocks with pattern: **filename**"""
-        text = """
+        """,
+                "main.py",
+                'print("Hello World")',
+            ),
+            # Pattern 2: **filename**
+            (
+                """
         **app.py**
         ```python
         def main():
             pass
         ```
-        """
-
+        """,
+                "app.py",
+                "def main():",
+            ),
+            # Pattern 3: filename on its own line
+            (
+                """
+        models.py
+        ```python
+        class User:
+            pass
+        ```
+        """,
+                "models.py",
+                "class User:",
+            ),
+        ],
+        ids=["language_filename", "bold_filename", "bare_filename"],
+    )
+    def test_extract_code_blocks_patterns(self, code_generator, text, filename, needle):
+        """Test extracting code blocks for each supported filename pattern."""
         files = code_generator.extract_code_blocks(text)
 
-        assert "app.py" in files
-        assert "def main():" in files["app.py"]
+        assert filename in files
+        assert needle in files[filename]
+
+    def test_pattern_is_precompiled(self):
+        """Test that the code block pattern is compiled once at module level."""
+        pattern = code_generator_module._CODE_BLOCK_RE
+
+        assert isinstance(pattern, re.Pattern)
+        assert pattern.flags & re.DOTALL
+        assert CodeGenerator._code_block_re is pattern
 
-    def test_extract_code_blocks_pattern3(self, code_generator):
-        """Test extracting code blocks with pattern: filename on its own line."""
+    def test_extract_code_blocks_pattern_precedence(self, code_generator):
+        """Test a language:filename block wins over earlier bold-filename blocks."""
         text = """
-        models.py
+        **main.py**
         ```python
-        class User:
-            pass
+        print("bold")
+        ```
+
+        ```python:main.py
+        print("explicit")
         ```
         """
 
         files = code_generator.extract_code_blocks(text)
 
-        assert "models.py" in files
-        assert "class User:" in files["models.py"]
+        assert files == {"main.py": 'print("explicit")'}
 
     def test_extract_multiple_files(self, code_generator):
         """Test extracting multiple files from text."""
@@ -112,6 +168,31 @@ class TestCodeGenerator:
         assert "main.py" in files
         assert "test.py" in files
 
+    def test_parse_file_structure_files_dict_skips_text_keys(self, code_generator):
+        """Test that a structured files map short-circuits code block scans."""
+        agent_output = {
+            "files": {"main.py": "print('hello')"},
+            "response": "**other.py**\n```python\npass\n```",
+        }
+
+        with patch.object(code_generator, "extract_code_blocks") as extract:
+            files = code_generator.parse_file_structure(agent_output)
+
+        assert files == {"main.py": "print('hello')"}
+        extract.assert_not_called()
+
+    def test_parse_file_structure_text_files_key_precedence(self, code_generator):
+        """Test that text under "files" overrides earlier keys and basic_files wins."""
+        agent_output = {
+            "files": "**main.py**\n```python\nfrom_files = True\n```",
+            "response": "**main.py**\n```python\nfrom_response = True\n```",
+            "basic_files": {"README.md": None},
+        }
+
+        files = code_generator.parse_file_structure(agent_output)
+
+        assert files == {"main.py": "from_files = True", "README.md": None}
+
     def test_parse_file_structure_from_string(self, code_generator):
         """Test parsing file structure from string with code blocks."""
         agent_output = {
@@ -129,48 +210,71 @@ class TestCodeGenerator:
         assert "main.py" in files
         assert "def main():" in files["main.py"]
 
-    def test_write_file(self, code_generator, temp_dir):
-        """Test writing a single file."""
-        project_dir = Path(temp_dir) / "test_project"
-        project_dir.mkdir()
+    def test_write_file_truncates_and_handles_large_content(
+        self, code_generator, tmp_path
+    ):
+        """Test that rewrites truncate and large UTF-8 content round-trips."""
+        large = "é" * (code_generator_module._PREALLOCATE_THRESHOLD + 1)
+        path = code_generator.write_file(tmp_path, "big.txt", large)
+        assert path.read_text(encoding="utf-8") == large
 
+        code_generator.write_file(tmp_path, "big.txt", "short")
+        assert path.read_text(encoding="utf-8") == "short"
+
+    def test_write_file(self, code_generator, tmp_path):
+        """Test writing a single file."""
         content = "print('hello world')"
-        written_path = code_generator.write_file(project_dir, "main.py", content)
+        written_path = code_generator.write_file(tmp_path, "main.py", content)
 
         assert written_path.exists()
         assert written_path.read_text() == content
 
-    def test_write_file_with_subdirectory(self, code_generator, temp_dir):
+    def test_write_file_with_subdirectory(self, code_generator, tmp_path):
         """Test writing a file in a subdirectory."""
-        project_dir = Path(temp_dir) / "test_project"
-        project_dir.mkdir()
-
         content = "def test(): pass"
         written_path = code_generator.write_file(
-            project_dir, "tests/test_main.py", content
+            tmp_path, "tests/test_main.py", content
         )
 
         assert written_path.exists()
-        assert (project_dir / "tests").exists()
+        assert (tmp_path / "tests").exists()
         assert written_path.read_text() == content
 
-    def test_write_files(self, code_generator, temp_dir):
+    def test_write_files(self, code_generator, tmp_path):
         """Test writing multiple files."""
-        project_dir = Path(temp_dir) / "test_project"
-        project_dir.mkdir()
-
         files = {
             "main.py": "print('main')",
             "config.py": "DEBUG=True",
             "tests/test_main.py": "def test(): pass",
+            "tests/conftest.py": "import pytest",
         }
 
-        written_paths = code_generator.write_files(project_dir, files)
+        written_paths = code_generator.write_files(tmp_path, files)
 
-        assert len(written_paths) == 3
-        assert (project_dir / "main.py").exists()
-        assert (project_dir / "config.py").exists()
-        assert (project_dir / "tests" / "test_main.py").exists()
+        assert len(written_paths) == 4
+        assert (tmp_path / "main.py").exists()
+        assert (tmp_path / "config.py").exists()
+        assert (tmp_path / "tests" / "test_main.py").exists()
+        assert (tmp_path / "tests" / "conftest.py").read_text() == "import pytest"
+
+    def test_write_files_aliased_paths_keep_last_value(self, code_generator, tmp_path):
+        """Test that keys naming the same file are written once, last value wins."""
+        files = {"src/main.py": "x" * 100_000, "./src/main.py": "small"}
+
+        written_paths = code_generator.write_files(tmp_path, files)
+
+        assert written_paths == [tmp_path / "src" / "main.py"]
+        assert (tmp_path / "src" / "main.py").read_text() == "small"
+
+    def test_write_files_accepts_generated_template(self, code_generator, tmp_path):
+        """Test that bytes from the project template are written unchanged."""
+        files = generate_fastapi_project("My App", "An example app")
+
+        written_paths = code_generator.write_files(tmp_path, files)
+
+        assert len(written_paths) == len(files)
+        for filepath, content in files.items():
+            assert (tmp_path / filepath).read_bytes() == content
 
     def test_generate_project_from_agent_output(self, code_generator, temp_dir):
         """Test generating a complete project from agent outputs."""
@@ -205,25 +309,22 @@ class TestCodeGenerator:
         assert (project_dir / "main.py").exists()
         assert (project_dir / "requirements.txt").exists()
 
-    def test_create_default_structure(self, code_generator, temp_dir):
+    def test_create_default_structure(self, code_generator, tmp_path):
         """Test creating default project structure."""
-        project_dir = Path(temp_dir) / "test_project"
-        project_dir.mkdir()
-
-        code_generator.create_default_structure(project_dir)
+        code_generator.create_default_structure(tmp_path)
 
         # Check directories exist
-        assert (project_dir / "src").exists()
-        assert (project_dir / "tests").exists()
-        assert (project_dir / "docs").exists()
-        assert (project_dir / "config").exists()
+        assert (tmp_path / "src").exists()
+        assert (tmp_path / "tests").exists()
+        assert (tmp_path / "docs").exists()
+        assert (tmp_path / "config").exists()
 
         # Check default files exist
-        assert (project_dir / ".gitignore").exists()
-        assert (project_dir / "README.md").exists()
+        assert (tmp_path / ".gitignore").exists()
+        assert (tmp_path / "README.md").exists()
 
         # Check content
-        gitignore_content = (project_dir / ".gitignore").read_text()
+        gitignore_content = (tmp_path / ".gitignore").read_text()
         assert "__pycache__" in gitignore_content
         assert ".env" in gitignore_content
 
@@ -5,7 +5,6 @@ from datetime import datetime
 from uuid import uuid4
 
 from models.database import (
-    Database,
     Project,
     Conversation,
     Artifact,
@@ -16,13 +15,12 @@ from models.database import (
 
 
 @pytest.fixture
-def test_db():
-    """Create test database."""
-    db = Database("sqlite:///:memory:")
-    db.create_all()
-    session = db.get_session()
-    yield session
-    session.close()
+def base_project(test_db):
+    """Create a flushed project for tests that need a parent row."""
+    project = Project(name="Test Project")
+    test_db.add(project)
+    test_db.flush()
+    return project
 
 
 class TestProject:
@@ -60,11 +58,9 @@ class TestProject:
 class TestConversation:
     """Test Conversation model."""
 
-    def test_conversation_creation(self, test_db):
+    def test_conversation_creation(self, test_db, base_project):
         """Test creating a conversation message."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         conversation = Conversation(
             project_id=project.id,
@@ -80,11 +76,9 @@ class TestConversation:
         assert conversation.content == "Build me an API"
         assert conversation.message_metadata["intent"] == "create"
 
-    def test_conversation_relationship(self, test_db):
+    def test_conversation_relationship(self, test_db, base_project):
         """Test conversation-project relationship."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         conv1 = Conversation(project_id=project.id, role="user", content="Message 1")
         conv2 = Conversation(
@@ -102,11 +96,9 @@ class TestConversation:
 class TestArtifact:
     """Test Artifact model."""
 
-    def test_artifact_creation(self, test_db):
+    def test_artifact_creation(self, test_db, base_project):
         """Test creating an artifact."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         artifact = Artifact(
             project_id=project.id,
@@ -123,17 +115,15 @@ class TestArtifact:
         assert artifact.path == "main.py"
         assert artifact.version == 1
 
-    def test_artifact_versioning(self, test_db):
+    def test_artifact_versioning(self, test_db, base_project):
         """Test artifact version increments."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         artifact = Artifact(
             project_id=project.id, type="code", path="main.py", content="v1", version=1
         )
         test_db.add(artifact)
-        test_db.commit()
+        test_db.flush()
 
         # Simulate update
         artifact.content = "v2"
@@ -147,11 +137,9 @@ class TestArtifact:
 class TestDeployment:
     """Test Deployment model."""
 
-    def test_deployment_creation(self, test_db):
+    def test_deployment_creation(self, test_db, base_project):
         """Test creating a deployment record."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         deployment = Deployment(
             project_id=project.id,
@@ -169,11 +157,9 @@ class TestDeployment:
         assert deployment.cloud_provider == "aws"
         assert deployment.resource_ids["ecs_task"] == "task-123"
 
-    def test_deployment_relationship(self, test_db):
+    def test_deployment_relationship(self, test_db, base_project):
         """Test deployment-project relationship."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         deployment = Deployment(
             project_id=project.id, environment="dev", status="deployed"
@@ -191,11 +177,9 @@ class TestDeployment:
 class TestDatabaseOperations:
     """Test database operations."""
 
-    def test_cascade_delete(self, test_db):
+    def test_cascade_delete(self, test_db, base_project):
         """Test that deleting project deletes related data."""
-        project = Project(name="Test Project")
-        test_db.add(project)
-        test_db.commit()
+        project = base_project
 
         # Add related data
         conversation = Conversation(project_id=project.id, role="user", content="test")
@@ -235,7 +219,7 @@ class TestDatabaseOperations:
         """Test updating project."""
         project = Project(name="Old Name", status=ProjectStatus.PLANNING.value)
         test_db.add(project)
-        test_db.commit()
+        test_db.flush()
 
         original_updated_at = project.updated_at
 
@@ -1,95 +1,113 @@
 """Unit tests for MultiAgentSystem functionality."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import threading
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 from multi_agent_system import MultiAgentSystem
 
+# Classes MultiAgentSystem instantiates, replaced with mocks in the fixture
+_PATCHED_CLASSES = (
+    "ProductManagerAgent",
+    "ArchitectAgent",
+    "BackendDeveloperAgent",
+    "QAEngineerAgent",
+    "DevOpsEngineerAgent",
+    "DocumentationAgent",
+    "OrchestratorAgent",
+)
+
 
 class TestMultiAgentSystem:
     """Test cases for MultiAgentSystem class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def system(self):
-        """Create a MultiAgentSystem instance for testing."""
-        with patch("multi_agent_system.ProductManagerAgent"):
-            with patch("multi_agent_system.ArchitectAgent"):
-                with patch("multi_agent_system.BackendDeveloperAgent"):
-                    with patch("multi_agent_system.QAEngineerAgent"):
-                        with patch("multi_agent_system.DevOpsEngineerAgent"):
-                            with patch("multi_agent_system.DocumentationAgent"):
-                                with patch("multi_agent_system.OrchestratorAgent"):
-                                    return MultiAgentSystem()
-
-    def test_system_initialization(self, system):
-        """Test that the system initializes correctly."""
-        assert system.orchestrator is not None
-        assert hasattr(system.orchestrator, "agent_registry")
-
-    @pytest.mark.asyncio
-    async def test_get_system_status(self, system):
-        """Test system status retrieval."""
-        # Mock orchestrator with agent registry
-        mock_agent1 = Mock()
-        mock_agent1.status = "ready"
-        mock_agent1.current_task = ""
+        """Create a MultiAgentSystem instance shared by the module."""
+        with patch.multiple(
+            "multi_agent_system", **dict.fromkeys(_PATCHED_CLASSES, DEFAULT)
+        ):
+            return MultiAgentSystem()
+
+    @pytest.fixture(autouse=True)
+    def _reset_system(self, system):
+        """Reset the shared system's orchestrator mock."""
+        system.orchestrator.reset_mock(return_value=True, side_effect=True)
+        system.orchestrator.agent_registry = {}
 
-        mock_agent2 = Mock()
-        mock_agent2.status = "working"
-        mock_agent2.current_task = "Test Task"
+    @pytest.fixture(autouse=True)
+    def development_threads(self):
+        """Record development threads started by the system under test.
 
-        system.orchestrator.agent_registry = {
-            "Agent1": mock_agent1,
-            "Agent2": mock_agent2,
-        }
+        Yields a callable that joins every recorded thread. Remaining threads
+        are joined on teardown so they cannot touch the next test's mocks.
+        """
+        started = []
 
-        # Get system status
-        status = await system.get_system_status()
+        def record_thread(*args, **kwargs):
+            thread = threading.Thread(*args, **kwargs)
+            started.append(thread)
+            return thread
 
-        # Verify status structure
-        assert "agents" in status
-        assert len(status["agents"]) == 2
-
-        # Check agent statuses
-        agent_statuses = {agent["name"]: agent for agent in status["agents"]}
-        assert agent_statuses["Agent1"]["status"] == "ready"
-        assert agent_statuses["Agent1"]["current_task"] == ""
-        assert agent_statuses["Agent2"]["status"] == "working"
-        assert agent_statuses["Agent2"]["current_task"] == "Test Task"
-
-    @pytest.mark.asyncio
-    async def test_get_system_status_empty_registry(self, system):
-        """Test system status when no agents are registered."""
-        # Empty agent registry
-        system.orchestrator.agent_registry = {}
+        def join_all():
+            for thread in started:
+                thread.join(timeout=2.0)
+                assert not thread.is_alive()
 
-        # Get system status
-        status = await system.get_system_status()
+        # Patch the module's reference only, leaving executor threads alone
+        with patch(
+            "multi_agent_system.threading", SimpleNamespace(Thread=record_thread)
+        ):
+            yield join_all
+        join_all()
 
-        # Verify empty status
-        assert "agents" in status
-        assert len(status["agents"]) == 0
-
-    @pytest.mark.asyncio
-    async def test_get_system_status_with_missing_attributes(self, system):
-        """Test system status when agents have missing attributes."""
-        # Mock agent without status/current_task attributes
-        mock_agent = Mock(spec=[])  # Empty spec to avoid auto-attributes
+    def test_system_initialization(self, system):
+        """Test that the system initializes correctly."""
+        assert system.orchestrator is not None
+        assert hasattr(system.orchestrator, "agent_registry")
 
-        system.orchestrator.agent_registry = {"TestAgent": mock_agent}
+    @pytest.mark.asyncio(loop_scope="class")
+    @pytest.mark.parametrize(
+        "registry,expected_agents",
+        [
+            (
+                {
+                    "Agent1": SimpleNamespace(status="ready", current_task=""),
+                    "Agent2": SimpleNamespace(
+                        status="working", current_task="Test Task"
+                    ),
+                },
+                [
+                    {"name": "Agent1", "status": "ready", "current_task": ""},
+                    {
+                        "name": "Agent2",
+                        "status": "working",
+                        "current_task": "Test Task",
+                    },
+                ],
+            ),
+            ({}, []),
+            # Agents without status/current_task attributes get the defaults
+            (
+                {"TestAgent": object()},
+                [{"name": "TestAgent", "status": "ready", "current_task": ""}],
+            ),
+        ],
+        ids=["mixed", "empty_registry", "missing_attributes"],
+    )
+    async def test_get_system_status(self, system, registry, expected_agents):
+        """Test system status retrieval for different agent registries."""
+        system.orchestrator.agent_registry = registry
 
-        # Get system status
         status = await system.get_system_status()
 
-        # Verify default values are used
-        agent_status = status["agents"][0]
-        assert agent_status["name"] == "TestAgent"
-        assert agent_status["status"] == "ready"  # default
-        assert agent_status["current_task"] == ""  # default
+        assert status["agents"] == expected_agents
+        assert status["agents_active"] == len(expected_agents)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_process_development_request_success(self, system):
         """Test successful development request processing."""
         # Mock orchestrator methods
@@ -113,23 +131,17 @@ class TestMultiAgentSystem:
             "test", "Test project"
         )
 
-    @pytest.mark.asyncio
-    async def test_process_development_request_background_execution(self, system):
+    @pytest.mark.asyncio(loop_scope="class")
+    async def test_process_development_request_background_execution(
+        self, system, development_threads
+    ):
         """Test that coordination runs in background thread."""
         # Mock successful coordination
         system.orchestrator.create_project = Mock(return_value="test-project-id")
         system.orchestrator.plan_project = Mock(return_value=[])
         system.orchestrator.agents = {"Agent1": Mock()}
 
-        # Create a mock that can track if it was called
-        coordination_called = False
-
-        def mock_coordinate(*args):
-            nonlocal coordination_called
-            coordination_called = True
-            return True
-
-        system.orchestrator.coordinate_agents = Mock(side_effect=mock_coordinate)
+        system.orchestrator.coordinate_agents = Mock(return_value=True)
 
         # Start development request
         result = await system.process_development_request(
@@ -140,11 +152,9 @@ class TestMultiAgentSystem:
         assert result["status"] == "started"
         assert result["project_id"] == "test-project-id"
 
-        # Give background thread time to execute
-        await asyncio.sleep(0.1)
-
         # Verify coordination was called in background
-        assert coordination_called
+        development_threads()
+        system.orchestrator.coordinate_agents.assert_called_once_with("test-project-id")
 
     def test_develop_application(self, system):
         """Test synchronous develop_application method."""
@@ -169,14 +179,14 @@ class TestMultiAgentSystem:
         system.orchestrator.plan_project.assert_called_once_with("test-project-id")
         system.orchestrator.coordinate_agents.assert_called_once_with("test-project-id")
 
-    @pytest.mark.asyncio
-    async def test_project_coordination_logging(self, system):
+    @pytest.mark.asyncio(loop_scope="class")
+    async def test_project_coordination_logging(self, system, development_threads):
         """Test that coordination activities are properly logged."""
         # Mock orchestrator with logging
         system.orchestrator.create_project = Mock(return_value="test-project-id")
         system.orchestrator.plan_project = Mock(return_value=[])
-        system.orchestrator.coordinate_agents = Mock(return_value=True)
         system.orchestrator.agents = {"Agent1": Mock()}
+        system.orchestrator.coordinate_agents = Mock(return_value=True)
 
         # Capture log messages by patching the logger
         with patch("multi_agent_system.logger") as mock_logger:
@@ -184,8 +194,8 @@ class TestMultiAgentSystem:
                 "Test project", {"project_type": "test"}
             )
 
-            # Give background thread time to execute
-            await asyncio.sleep(0.1)
+            # Wait for the background thread to finish
+            development_threads()
 
             # Verify logging calls
             mock_logger.info.assert_called()
@@ -194,8 +204,10 @@ class TestMultiAgentSystem:
             # Check for expected log messages
             assert any("Processing development request" in call for call in log_calls)
 
-    @pytest.mark.asyncio
-    async def test_error_handling_in_background_thread(self, system):
+    @pytest.mark.asyncio(loop_scope="class")
+    async def test_error_handling_in_background_thread(
+        self, system, development_threads
+    ):
         """Test error handling in background coordination thread."""
         # Mock orchestrator methods
         system.orchestrator.create_project = Mock(return_value="test-project-id")
@@ -211,8 +223,8 @@ class TestMultiAgentSystem:
                 "Test project", {"project_type": "test"}
             )
 
-            # Give background thread time to execute and handle error
-            await asyncio.sleep(0.1)
+            # Wait for the background thread to handle the error
+            development_threads()
 
             # Verify error was logged
             mock_logger.error.assert_called()
@@ -225,15 +237,21 @@ class TestMultiAgentSystem:
         # This is tested indirectly by checking the system can access agents
         assert hasattr(system.orchestrator, "agent_registry")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_concurrent_development_requests(self, system):
         """Test handling multiple concurrent development requests."""
         # Mock orchestrator to return different project IDs
         project_ids = ["project-1", "project-2", "project-3"]
-        system.orchestrator.create_project = Mock(side_effect=project_ids)
-        system.orchestrator.plan_project = Mock(return_value=[])
-        system.orchestrator.coordinate_agents = Mock(return_value=True)
-        system.orchestrator.agents = {"Agent1": Mock()}
+        # Configure the shared orchestrator's existing child mocks in place;
+        # create_project is called synchronously, so it stays a plain Mock
+        system.orchestrator.configure_mock(
+            **{
+                "create_project.side_effect": project_ids,
+                "plan_project.return_value": [],
+                "coordinate_agents.return_value": True,
+                "agents": {"Agent1": Mock()},
+            }
+        )
 
         # Start multiple requests concurrently
         tasks = [
@@ -1,41 +1,98 @@
 """Unit tests for OrchestratorAgent functionality."""
 
+import copy
+import itertools
 import uuid
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-from agents.base_agent import BaseAgent
 from agents.orchestrator import OrchestratorAgent
 from utils.project_state import ProjectPhase, ProjectState, Task, TaskStatus
 
+# (task name, assigned agent, names of tasks it depends on) for each planned task
+EXPECTED_PLAN = (
+    ("Analyze Requirements", "ProductManager", ()),
+    ("Design Architecture", "Architect", ("Analyze Requirements",)),
+    ("Implement Backend", "BackendDeveloper", ("Design Architecture",)),
+    ("Write Tests", "QAEngineer", ("Implement Backend",)),
+    ("Prepare Deployment", "DevOpsEngineer", ("Write Tests",)),
+    ("Create User Documentation", "DocumentationAgent", ("Prepare Deployment",)),
+)
+
+# Agents the orchestrator's plan assigns tasks to
+PLANNED_AGENTS = tuple(agent for _, agent, _ in EXPECTED_PLAN)
+
+
+class _StubAgent:
+    """Minimal stand-in for a BaseAgent as seen by the orchestrator.
+
+    Only process_request is a Mock, so tests can still configure and
+    inspect calls without introspecting the whole BaseAgent class.
+    """
+
+    def __init__(self):
+        self.status = "ready"
+        self.current_task = ""
+        self.process_request = Mock(
+            return_value={"status": "success", "response": "Mock agent response"}
+        )
+
 
 class TestOrchestratorAgent:
     """Test cases for OrchestratorAgent class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def orchestrator(self):
-        """Create an OrchestratorAgent instance for testing."""
+        """Create an OrchestratorAgent instance shared by the module."""
         with patch("agents.orchestrator.get_agent_config") as mock_config:
             mock_config.return_value = {
                 "system_prompt": "Test orchestrator prompt",
                 "llm_config": {"model": "claude-3-5-sonnet-20241022"},
             }
-            with patch("agents.base_agent.AnthropicChatCompletionClient"):
-                with patch("agents.base_agent.AssistantAgent"):
-                    return OrchestratorAgent()
+            return OrchestratorAgent()
+
+    @pytest.fixture(autouse=True)
+    def _sequential_uuids(self, monkeypatch):
+        """Generate orchestrator IDs from a counter; they are opaque here."""
+        counter = itertools.count(1)
+        monkeypatch.setattr(
+            "agents.orchestrator.uuid",
+            SimpleNamespace(uuid4=lambda: uuid.UUID(int=next(counter))),
+        )
+
+    @pytest.fixture(autouse=True)
+    def _reset_orchestrator(self, orchestrator):
+        """Clear projects and registered agents left by the previous test."""
+        orchestrator.project_states.clear()
+        orchestrator.agent_registry.clear()
 
     @pytest.fixture
     def mock_agent(self):
         """Create a mock agent for testing."""
-        agent = Mock(spec=BaseAgent)
-        agent.status = "ready"
-        agent.current_task = ""
-        agent.process_request.return_value = {
-            "status": "success",
-            "response": "Mock agent response",
-        }
-        return agent
+        return _StubAgent()
+
+    @pytest.fixture(scope="module")
+    def planned_template(self, orchestrator):
+        """Create and plan a project once per module."""
+        project_id = orchestrator.create_project("Test Project", "Test requirements")
+        orchestrator.plan_project(project_id)
+        return orchestrator.project_states.pop(project_id)
+
+    @pytest.fixture
+    def planned_project(self, orchestrator, planned_template):
+        """Register a fresh copy of the planned template, returning its ID."""
+        project = copy.deepcopy(planned_template)
+        project.project_id = str(uuid.uuid4())
+        orchestrator.project_states[project.project_id] = project
+        return project.project_id
+
+    @pytest.fixture
+    def all_agents_registered(self, orchestrator, mock_agent):
+        """Register the mock agent under every name the plan assigns to."""
+        orchestrator.agent_registry.update(dict.fromkeys(PLANNED_AGENTS, mock_agent))
+        return mock_agent
 
     def test_orchestrator_initialization(self, orchestrator):
         """Test that orchestrator initializes correctly."""
@@ -71,136 +128,101 @@ class TestOrchestratorAgent:
         # Plan the project
         tasks = orchestrator.plan_project(project_id)
 
-        # Verify correct number of tasks
-        assert len(tasks) == 6
-
-        # Verify task sequence and dependencies
-        task_names = [task.name for task in tasks]
-        expected_names = [
-            "Analyze Requirements",
-            "Design Architecture",
-            "Implement Backend",
-            "Write Tests",
-            "Prepare Deployment",
-            "Create User Documentation",
-        ]
-        assert task_names == expected_names
-
-        # Verify agent assignments
-        expected_agents = [
-            "ProductManager",
-            "Architect",
-            "BackendDeveloper",
-            "QAEngineer",
-            "DevOpsEngineer",
-            "DocumentationAgent",
-        ]
-        actual_agents = [task.assigned_to for task in tasks]
-        assert actual_agents == expected_agents
-
-        # Verify dependency chain
-        assert tasks[0].dependencies == []  # First task has no dependencies
-        assert tasks[1].dependencies == [
-            tasks[0].id
-        ]  # Architecture depends on requirements
-        assert tasks[2].dependencies == [tasks[1].id]  # Backend depends on architecture
-        assert tasks[3].dependencies == [tasks[2].id]  # Tests depend on backend
-        assert tasks[4].dependencies == [tasks[3].id]  # Deployment depends on tests
-        assert tasks[5].dependencies == [
-            tasks[4].id
-        ]  # Documentation depends on deployment
+        # Verify task sequence, agent assignments and dependency chain
+        names_by_id = {task.id: task.name for task in tasks}
+        assert (
+            tuple(
+                (
+                    task.name,
+                    task.assigned_to,
+                    tuple(names_by_id[dep] for dep in task.dependencies),
+                )
+                for task in tasks
+            )
+            == EXPECTED_PLAN
+        )
 
     def test_plan_project_invalid_project_id(self, orchestrator):
         """Test planning with invalid project ID raises error."""
         with pytest.raises(ValueError, match="Project .* not found"):
             orchestrator.plan_project("invalid-id")
 
-    def test_execute_next_tasks_success(self, orchestrator, mock_agent):
-        """Test successful task execution."""
-        # Setup project with tasks
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
+    @pytest.mark.parametrize(
+        "agent_behaviour,expected_status,expected_error,"
+        "expected_agent_status,expected_current_task",
+        [
+            (
+                {
+                    "return_value": {
+                        "status": "success",
+                        "response": "Mock agent response",
+                    }
+                },
+                "success",
+                None,
+                "ready",
+                "",
+            ),
+            (
+                {"return_value": {"status": "error", "error": "Mock agent error"}},
+                "error",
+                "Mock agent error",
+                "error",
+                "Failed: Analyze Requirements",
+            ),
+            (
+                {"side_effect": Exception("Test exception")},
+                "error",
+                "Test exception",
+                "error",
+                "Error: Test exception...",
+            ),
+        ],
+        ids=["success", "agent_error", "exception"],
+    )
+    def test_execute_next_tasks(
+        self,
+        orchestrator,
+        mock_agent,
+        planned_project,
+        agent_behaviour,
+        expected_status,
+        expected_error,
+        expected_agent_status,
+        expected_current_task,
+    ):
+        """Test task execution for successful, failing and raising agents."""
+        mock_agent.process_request.configure_mock(**agent_behaviour)
         orchestrator.register_agent("ProductManager", mock_agent)
-        orchestrator.plan_project(project_id)
 
         # Execute next tasks
-        results = orchestrator.execute_next_tasks(project_id)
+        results = orchestrator.execute_next_tasks(planned_project)
 
-        # Verify task execution
-        assert len(results) == 1  # Should execute the first ready task
-        assert results[0]["status"] == "success"
+        # Only the first ready task runs
+        assert len(results) == 1
+        assert results[0]["status"] == expected_status
+        assert results[0].get("error") == expected_error
 
         # Verify agent status was updated
-        assert mock_agent.status == "ready"
-        assert mock_agent.current_task == ""
+        assert mock_agent.status == expected_agent_status
+        assert mock_agent.current_task == expected_current_task
 
-    def test_execute_next_tasks_agent_not_found(self, orchestrator):
+    def test_execute_next_tasks_agent_not_found(self, orchestrator, planned_project):
         """Test task execution when assigned agent is not registered."""
-        # Setup project without registering the required agent
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.plan_project(project_id)
-
         # Execute next tasks (should fail because ProductManager is not registered)
-        results = orchestrator.execute_next_tasks(project_id)
+        results = orchestrator.execute_next_tasks(planned_project)
 
         # Verify no successful results
         assert len(results) == 0
 
         # Verify task was marked as failed
-        project = orchestrator.project_states[project_id]
+        project = orchestrator.project_states[planned_project]
         first_task = next(iter(project.tasks.values()))
         assert first_task.status == TaskStatus.FAILED
 
-    def test_execute_next_tasks_agent_error(self, orchestrator, mock_agent):
-        """Test task execution when agent returns error."""
-        # Setup agent to return error
-        mock_agent.process_request.return_value = {
-            "status": "error",
-            "error": "Mock agent error",
-        }
-
-        # Setup project
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.register_agent("ProductManager", mock_agent)
-        orchestrator.plan_project(project_id)
-
-        # Execute next tasks
-        results = orchestrator.execute_next_tasks(project_id)
-
-        # Verify error handling
-        assert len(results) == 1
-        assert results[0]["status"] == "error"
-
-        # Verify agent status
-        assert mock_agent.status == "error"
-        assert "Failed: Analyze Requirements" in mock_agent.current_task
-
-    def test_execute_next_tasks_exception_handling(self, orchestrator, mock_agent):
-        """Test task execution when agent throws exception."""
-        # Setup agent to throw exception
-        mock_agent.process_request.side_effect = Exception("Test exception")
-
-        # Setup project
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.register_agent("ProductManager", mock_agent)
-        orchestrator.plan_project(project_id)
-
-        # Execute next tasks
-        results = orchestrator.execute_next_tasks(project_id)
-
-        # Verify exception handling
-        assert len(results) == 1
-        assert results[0]["status"] == "error"
-        assert "Test exception" in results[0]["error"]
-
-        # Verify agent status
-        assert mock_agent.status == "error"
-        assert "Error: Test exception" in mock_agent.current_task
-
-    def test_get_project_status(self, orchestrator):
+    def test_get_project_status(self, orchestrator, planned_project):
         """Test project status retrieval."""
-        # Create and plan project
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.plan_project(project_id)
+        project_id = planned_project
 
         # Get status
         status = orchestrator.get_project_status(project_id)
@@ -219,24 +241,18 @@ class TestOrchestratorAgent:
         with pytest.raises(ValueError, match="Project .* not found"):
             orchestrator.get_project_status("invalid-id")
 
-    def test_coordinate_agents_success_flow(self, orchestrator, mock_agent):
+    def test_coordinate_agents_success_flow(
+        self, orchestrator, all_agents_registered, planned_project
+    ):
         """Test complete agent coordination flow."""
-        # Setup project and agent
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.register_agent("ProductManager", mock_agent)
-        orchestrator.register_agent("Architect", mock_agent)
-        orchestrator.register_agent("BackendDeveloper", mock_agent)
-        orchestrator.register_agent("QAEngineer", mock_agent)
-        orchestrator.register_agent("DevOpsEngineer", mock_agent)
-        orchestrator.register_agent("DocumentationAgent", mock_agent)
-
-        orchestrator.plan_project(project_id)
+        project_id = planned_project
+        mock_agent = all_agents_registered
 
         # Mock successful completion for all tasks
-        def mock_success(*args, **kwargs):
-            return {"status": "success", "response": "Success"}
-
-        mock_agent.process_request.side_effect = mock_success
+        mock_agent.process_request.return_value = {
+            "status": "success",
+            "response": "Success",
+        }
 
         # Coordinate agents
         result = orchestrator.coordinate_agents(project_id)
@@ -248,25 +264,18 @@ class TestOrchestratorAgent:
         project = orchestrator.project_states[project_id]
         assert project.phase == ProjectPhase.COMPLETED
 
-    def test_coordinate_agents_with_blocked_tasks(self, orchestrator):
+    def test_coordinate_agents_with_blocked_tasks(self, orchestrator, planned_project):
         """Test coordination when tasks are blocked."""
-        # Create project without any agents registered
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
-        orchestrator.plan_project(project_id)
-
-        # Coordinate should return False due to blocked tasks
-        result = orchestrator.coordinate_agents(project_id)
+        # No agents are registered, so coordinate should return False
+        result = orchestrator.coordinate_agents(planned_project)
         assert result is False
 
-    def test_task_context_preparation(self, orchestrator, mock_agent):
+    def test_task_context_preparation(self, orchestrator, mock_agent, planned_project):
         """Test that task context is properly prepared."""
-        # Setup project
-        project_id = orchestrator.create_project("Test Project", "Test requirements")
         orchestrator.register_agent("ProductManager", mock_agent)
-        orchestrator.plan_project(project_id)
 
         # Execute task and capture the context passed to agent
-        orchestrator.execute_next_tasks(project_id)
+        orchestrator.execute_next_tasks(planned_project)
 
         # Verify agent was called with correct context
         mock_agent.process_request.assert_called_once()
@@ -1,27 +1,14 @@
 """Unit tests for project service."""
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from models.database import Base, Project, Conversation
+from models.database import Project, ProjectStatus, Conversation
 from services.project_service import ProjectService
 
 
-@pytest.fixture
-def test_db():
-    """Create test database."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def project_service():
-    """Create project service instance."""
+    """Create a stateless project service shared by the session."""
     return ProjectService()
 
 
@@ -92,10 +79,18 @@ class TestProjectService:
 
     def test_list_projects(self, project_service, test_db):
         """Test listing projects."""
-        # Create multiple projects
-        project_service.create_project("Project 1", "Description 1", test_db)
-        project_service.create_project("Project 2", "Description 2", test_db)
-        project_service.create_project("Project 3", "Description 3", test_db)
+        # Insert the projects in one flush; creation is covered above
+        test_db.add_all(
+            [
+                Project(
+                    name=f"Project {i}",
+                    description=f"Description {i}",
+                    status=ProjectStatus.PLANNING.value,
+                )
+                for i in range(1, 4)
+            ]
+        )
+        test_db.flush()
 
         # List all projects
         projects = project_service.list_projects(test_db)
@@ -1,6 +1,10 @@
 """Unit tests for project state management utilities."""
 
+import copy
+import json
+import shutil
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 
@@ -42,6 +46,21 @@ class TestTask:
         assert task.dependencies == []
         assert task.status == TaskStatus.PENDING
 
+    def test_task_is_slotted_and_copyable(self):
+        """Test that tasks carry no instance dict and survive deepcopy."""
+        task = Task(
+            id="test-id",
+            name="Test Task",
+            description="Test description",
+            assigned_to="TestAgent",
+            dependencies=["dep1"],
+        )
+
+        assert not hasattr(task, "__dict__")
+        clone = copy.deepcopy(task)
+        assert clone == task
+        assert clone.dependencies is not task.dependencies
+
     def test_task_status_enum_values(self):
         """Test that TaskStatus enum has correct values."""
         assert TaskStatus.PENDING.value == "pending"
@@ -426,6 +445,70 @@ class TestProjectState:
         # Task should not be ready due to missing dependency
         assert len(ready_tasks) == 0
 
+    def test_get_ready_tasks_dependency_added_later(self, project_state):
+        """Test a task becomes ready once a completed dependency is added."""
+        child = Task(
+            id="task-2",
+            name="Task 2",
+            description="Description 2",
+            assigned_to="Agent2",
+            dependencies=["task-1"],
+        )
+        parent = Task(
+            id="task-1",
+            name="Task 1",
+            description="Description 1",
+            assigned_to="Agent1",
+            status=TaskStatus.COMPLETED,
+        )
+
+        project_state.add_task(child)
+        assert project_state.get_ready_tasks() == []
+
+        project_state.add_task(parent)
+        assert project_state.get_ready_tasks() == [child]
+
+    def test_get_ready_tasks_self_dependency_added_completed(self, project_state):
+        """Test that a completed self-dependent task stays blocked when reopened."""
+        project_state.add_task(
+            Task(
+                id="task-1",
+                name="Task 1",
+                description="",
+                assigned_to="TestAgent",
+                dependencies=["task-1"],
+                status=TaskStatus.COMPLETED,
+            )
+        )
+
+        project_state.update_task_status("task-1", TaskStatus.PENDING)
+
+        assert project_state.get_ready_tasks() == []
+
+    def test_get_ready_tasks_after_dependency_reopened(self, project_state):
+        """Test a dependent task leaves the ready set when its dependency reopens."""
+        parent = Task(
+            id="task-1",
+            name="Task 1",
+            description="Description 1",
+            assigned_to="Agent1",
+        )
+        child = Task(
+            id="task-2",
+            name="Task 2",
+            description="Description 2",
+            assigned_to="Agent2",
+            dependencies=["task-1"],
+        )
+        project_state.add_task(parent)
+        project_state.add_task(child)
+
+        project_state.update_task_status("task-1", TaskStatus.COMPLETED)
+        assert project_state.get_ready_tasks() == [child]
+
+        project_state.update_task_status("task-1", TaskStatus.PENDING)
+        assert project_state.get_ready_tasks() == [parent]
+
     def test_task_timing_tracking(self, project_state, sample_task):
         """Test that task timing is properly tracked."""
         project_state.add_task(sample_task)
@@ -436,3 +519,158 @@ class TestProjectState:
         # Complete task
         project_state.update_task_status(sample_task.id, TaskStatus.COMPLETED)
         assert sample_task.completed_at is not None
+
+    def test_save_to_file_creates_directory_once(self, project_state, tmp_path):
+        """Test that repeated saves skip makedirs for a known directory."""
+        filepath = str(tmp_path / "state" / "project.json")
+        project_state.save_to_file(filepath)
+
+        with patch("utils.project_state.os.makedirs") as makedirs:
+            project_state.save_to_file(filepath)
+
+        makedirs.assert_not_called()
+        assert ProjectState.load_from_file(filepath).project_id == "test-project-id"
+
+    def test_save_recreates_deleted_directory(
+        self, project_state, sample_task, tmp_path
+    ):
+        """Test that saves recover when a known directory has been removed."""
+        state_dir = tmp_path / "state"
+        filepath = str(state_dir / "project.json")
+        delta_path = str(state_dir / "project.jsonl")
+        project_state.save_to_file(filepath)
+        shutil.rmtree(state_dir)
+
+        project_state.save_to_file(filepath)
+        assert ProjectState.load_from_file(filepath).project_id == "test-project-id"
+
+        shutil.rmtree(state_dir)
+        project_state.add_task(sample_task)
+        project_state.save_delta(delta_path)
+        assert (state_dir / "project.jsonl").exists()
+
+    def test_load_from_file_restores_timestamps(
+        self, project_state, sample_task, tmp_path
+    ):
+        """Test that a save/load round trip keeps project and task timestamps."""
+        project_state.add_task(sample_task)
+        project_state.update_task_status(sample_task.id, TaskStatus.COMPLETED)
+        filepath = str(tmp_path / "project.json")
+        project_state.save_to_file(filepath)
+
+        loaded = ProjectState.load_from_file(filepath)
+
+        loaded_task = loaded.tasks[sample_task.id]
+        assert loaded.created_at == project_state.created_at
+        assert loaded_task.created_at == sample_task.created_at
+        assert loaded_task.completed_at == sample_task.completed_at
+
+    def test_large_text_artifact_is_compressed(self, project_state, tmp_path):
+        """Test that large artifacts are compressed but read back unchanged."""
+        content = "print('hello')\n" * 1000
+        project_state.add_artifact("main.py", content)
+        project_state.add_artifact("small", {"files": 1})
+
+        assert "content" not in project_state.artifacts["main.py"]
+        assert len(project_state.artifacts["main.py"]["compressed"]) < len(content)
+        assert project_state.get_artifact("main.py") == content
+        assert project_state.get_artifact("small") == {"files": 1}
+
+        filepath = str(tmp_path / "project.json")
+        project_state.save_to_file(filepath)
+        loaded = ProjectState.load_from_file(filepath)
+        assert loaded.artifacts["main.py"]["encoding"] == "zstd"
+        assert loaded.artifacts["main.py"]["created_at"] == (
+            project_state.artifacts["main.py"]["created_at"]
+        )
+        assert loaded.get_artifact("main.py") == content
+        assert loaded.get_artifact("small") == {"files": 1}
+
+    def test_save_delta_writes_changed_tasks(self, project_state, tmp_path):
+        """Test that save_delta appends only tasks changed since the last save."""
+        for i in range(3):
+            project_state.add_task(
+                Task(
+                    id=f"task-{i}",
+                    name=f"Task {i}",
+                    description="",
+                    assigned_to="TestAgent",
+                )
+            )
+        project_state.save_to_file(str(tmp_path / "state.json"))
+
+        delta_file = tmp_path / "state.jsonl"
+        project_state.update_task_status("task-1", TaskStatus.COMPLETED)
+        project_state.save_delta(str(delta_file))
+        project_state.save_delta(str(delta_file))
+
+        records = [json.loads(line) for line in delta_file.read_text().splitlines()]
+        assert [r["task_id"] for r in records] == ["task-1"]
+        assert records[0]["fields"]["status"] == "completed"
+
+    def test_to_dict_reflects_direct_task_edits(
+        self, project_state, sample_task, tmp_path
+    ):
+        """Test that fields set directly on a task are serialized after a save."""
+        project_state.add_task(sample_task)
+        project_state.save_to_file(str(tmp_path / "state.json"))
+
+        sample_task.error = "boom"
+
+        assert project_state.to_dict()["tasks"][sample_task.id]["error"] == "boom"
+
+    def test_pop_ready_prefers_tasks_with_more_dependents(self, project_state):
+        """Test that pop_ready orders ready tasks by descendant count."""
+        for task_id, deps in [
+            ("leaf", []),
+            ("root", []),
+            ("child", ["root"]),
+            ("grandchild", ["child"]),
+        ]:
+            project_state.add_task(
+                Task(
+                    id=task_id,
+                    name=task_id,
+                    description="",
+                    assigned_to="TestAgent",
+                    dependencies=deps,
+                )
+            )
+
+        assert project_state.peek_ready().id == "root"
+        assert project_state.pop_ready().id == "root"
+        assert project_state.pop_ready().id == "leaf"
+        assert project_state.pop_ready() is None
+
+        project_state.update_task_status("root", TaskStatus.COMPLETED)
+        assert project_state.pop_ready().id == "child"
+
+    def test_descendant_counts_cached_until_edges_change(self, project_state):
+        """Test that descendant counts are reused until a dependency is added."""
+        for task_id, deps in [("a", []), ("b", []), ("b1", ["b"])]:
+            project_state.add_task(
+                Task(
+                    id=task_id,
+                    name=task_id,
+                    description="",
+                    assigned_to="TestAgent",
+                    dependencies=deps,
+                )
+            )
+
+        assert project_state.peek_ready().id == "b"
+        assert project_state._descendant_counts == {"a": 0, "b": 1}
+
+        for task_id in ("a1", "a2"):
+            project_state.add_task(
+                Task(
+                    id=task_id,
+                    name=task_id,
+                    description="",
+                    assigned_to="TestAgent",
+                    dependencies=["a"],
+                )
+            )
+
+        assert project_state._descendant_counts == {}
+        assert project_state.peek_ready().id == "a"
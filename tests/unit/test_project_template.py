@@ -0,0 +1,194 @@
+"""Unit tests for the project template utilities."""
+
+import pytest
+
+from utils import project_template as project_template_module
+from utils.project_template import (
+    ProjectTemplate,
+    add_authentication,
+    add_database_support,
+    finalize,
+    generate_fastapi_project,
+    iter_fastapi_project,
+    write_fastapi_project,
+    write_project,
+)
+
+
+class TestProjectTemplate:
+    """Test suite for the project template functions."""
+
+    @pytest.fixture
+    def files(self):
+        """Generate a project with default features."""
+        return generate_fastapi_project("My App", "An example app")
+
+    def test_generate_fastapi_project_files(self, files):
+        """Test that the project contains every expected file."""
+        assert set(files) == {
+            "main.py",
+            "requirements.txt",
+            "Dockerfile",
+            ".dockerignore",
+            "README.md",
+            "tests/__init__.py",
+            "tests/test_main.py",
+            ".github/workflows/ci-cd.yml",
+            ".env.example",
+            ".gitignore",
+        }
+
+    def test_generated_files_are_utf8_bytes(self):
+        """Test that every file is returned as UTF-8 encoded bytes."""
+        files = generate_fastapi_project("Café", "Crème brûlée")
+
+        assert all(isinstance(content, bytes) for content in files.values())
+        assert "Crème brûlée".encode("utf-8") in files["main.py"]
+
+    def test_generate_fastapi_project_substitutes_inputs(self, files):
+        """Test that project name, description and safe name are filled in."""
+        assert b'title="My App"' in files["main.py"]
+        assert b'description="An example app"' in files["main.py"]
+        assert files["README.md"].startswith(b"# My App\n\nAn example app\n")
+        assert b"- RESTful API\n- Health check endpoint" in files["README.md"]
+        assert b"docker build -t my_app ." in files["README.md"]
+        assert b"docker build -t my_app:latest ." in (
+            files[".github/workflows/ci-cd.yml"]
+        )
+
+    def test_generate_fastapi_project_lists_features(self):
+        """Test that custom features replace the default feature list."""
+        files = generate_fastapi_project(
+            "My App", "An example app", ["Search", "Export"]
+        )
+
+        assert b"## Features\n\n- Search\n- Export\n" in files["README.md"]
+        assert b"Health check endpoint" not in files["README.md"]
+
+    def test_template_values_are_not_re_expanded(self):
+        """Test that placeholder syntax inside a value is kept verbatim."""
+        files = generate_fastapi_project("My App", "Costs ${safe_name} dollars")
+
+        assert b"Costs ${safe_name} dollars" in files["README.md"]
+
+    def test_template_values_reject_nul(self):
+        """Test that NUL characters in inputs are rejected."""
+        with pytest.raises(ValueError, match="description"):
+            generate_fastapi_project("My App", "bad\x00value")
+
+    def test_iter_fastapi_project_matches_dict(self, files):
+        """Test that the streaming API yields the same files as the dict API."""
+        streamed = list(iter_fastapi_project("My App", "An example app"))
+
+        assert dict(streamed) == files
+        assert len(streamed) == len(files)
+
+    def test_generate_fastapi_project_is_memoized(self):
+        """Test that repeated calls share one cached, read-only mapping."""
+        first = generate_fastapi_project("Cached", "App", ["A"])
+        second = generate_fastapi_project("Cached", "App", ("A",))
+
+        assert second is first
+        with pytest.raises(TypeError):
+            first["main.py"] = b"changed"
+
+    def test_write_fastapi_project(self, files, tmp_path):
+        """Test that the project is written to disk file by file."""
+        written = write_fastapi_project(tmp_path, "My App", "An example app")
+
+        assert len(written) == len(files)
+        for filepath, content in files.items():
+            assert (tmp_path / filepath).read_bytes() == content
+
+    def test_write_project(self, files, tmp_path):
+        """Test that project files are written to disk in a thread pool."""
+        files = add_database_support(files, "postgresql")
+
+        written = write_project(files, tmp_path)
+
+        assert written == [tmp_path / filepath for filepath in files]
+        for filepath, content in files.items():
+            assert (tmp_path / filepath).read_bytes() == content
+
+    def test_write_project_collapses_aliased_paths(self, tmp_path):
+        """Test that keys naming the same file are written once, last value wins."""
+        written = write_project({"a.py": b"first", "./a.py": b"last"}, tmp_path)
+
+        assert written == [tmp_path / "a.py"]
+        assert (tmp_path / "a.py").read_bytes() == b"last"
+
+    def test_static_files_are_shared_constants(self, files):
+        """Test that project-independent files come from module constants."""
+        for path, content in project_template_module._STATIC_FILES.items():
+            assert files[path] == content
+
+    @pytest.mark.parametrize(
+        "db_type, driver",
+        [
+            ("sqlite", None),
+            ("postgresql", b"psycopg2-binary==2.9.10"),
+            ("mysql", b"pymysql==1.1.1"),
+        ],
+    )
+    def test_add_database_support(self, files, db_type, driver):
+        """Test that database modules and requirements are added."""
+        files = add_database_support(files, db_type)
+
+        requirements = files["requirements.txt"]
+        assert b"sqlalchemy==2.0.43" in requirements
+        assert b"alembic==1.14.0" in requirements
+        if driver:
+            assert requirements.endswith(driver + b"\n")
+        assert b'connect_args={"check_same_thread": False}' in files["database.py"]
+        assert b"class Item(Base):" in files["models.py"]
+
+    def test_add_database_support_rejects_unknown_db_type(self, files):
+        """Test that an unsupported database type raises ValueError."""
+        with pytest.raises(ValueError, match="oracle"):
+            add_database_support(files, "oracle")
+
+    def test_add_authentication(self, files):
+        """Test that the auth module and its requirements are added."""
+        files = add_authentication(files)
+
+        assert b"python-jose[cryptography]==3.3.0" in files["requirements.txt"]
+        assert b"def create_access_token" in files["auth.py"]
+
+    def test_add_functions_layer_without_copying(self, files):
+        """Test that add_* stack overlays and leave the base files untouched."""
+        base_requirements = files["requirements.txt"]
+
+        layered = add_authentication(add_database_support(files, "mysql"))
+
+        assert files["requirements.txt"] == base_requirements
+        assert "auth.py" not in files
+        assert len(layered.maps) == 3
+        assert layered.maps[-1] is files
+        assert layered["requirements.txt"].startswith(base_requirements)
+        assert layered["requirements.txt"].endswith(
+            b"pymysql==1.1.1\npython-jose[cryptography]==3.3.0\n"
+            b"passlib[bcrypt]==1.7.4\npython-multipart==0.0.20\n"
+        )
+
+        flat = finalize(layered)
+        assert type(flat) is dict
+        assert set(flat) == set(files) | {"database.py", "models.py", "auth.py"}
+
+    def test_project_template_class_keeps_text_api(self, files):
+        """Test that the deprecated class returns and mutates text dicts."""
+        legacy = ProjectTemplate.generate_fastapi_project("My App", "An example app")
+
+        assert type(legacy) is dict
+        assert legacy == {path: content.decode() for path, content in files.items()}
+        legacy["main.py"] += "# edited\n"
+        assert not files["main.py"].endswith(b"# edited\n")
+
+        result = ProjectTemplate.add_authentication(
+            ProjectTemplate.add_database_support(legacy, "mysql")
+        )
+
+        expected = finalize(add_authentication(add_database_support(files, "mysql")))
+        assert result is legacy
+        assert legacy["main.py"].endswith("# edited\n")
+        del legacy["main.py"], expected["main.py"]
+        assert legacy == {path: content.decode() for path, content in expected.items()}
@@ -1,17 +1,132 @@
 """Code generation utility for writing actual project files to disk."""
 
+import functools
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Code block pattern used by CodeGenerator.extract_code_blocks, one
+# alternative per supported filename style so the text is scanned once:
+# 1. ```language:filename
+# 2. **filename** followed by code block
+# 3. Filename on its own line followed by code block
+# Block bodies use a possessive "anything but a closing fence" loop instead
+# of a lazy .*?, so an unterminated fence fails in one pass, no backtracking.
+_BODY = r"(?:[^`]++|`(?!``))*+"
+_CODE_BLOCK_RE = re.compile(
+    rf"```(?:\w+):(?P<fn1>[^\n]+)\n(?P<c1>{_BODY})```"
+    rf"|\*\*(?P<fn2>[^\*]+\.\w+)\*\*\s*```(?:\w+)?\n(?P<c2>{_BODY})```"
+    rf"|\n\s*(?P<fn3>[a-zA-Z0-9_\-/]+\.\w+)\s*\n\s*```(?:\w+)?\n(?P<c3>{_BODY})```",
+    re.DOTALL,
+)
+
+# Keys where agents put generated code, in precedence order; later keys
+# override earlier ones
+_FILE_KEYS = ("response", "generated_code", "code", "files", "output")
+
+# Raw file write settings: flags for os.open, and the size above which the
+# file is preallocated before writing
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+_PREALLOCATE_THRESHOLD = 1 << 20
+
+# Project name sanitization patterns
+_SANITIZE_NONWORD = re.compile(r"[^\w\s-]")
+_SANITIZE_SEP = re.compile(r"[-\s]+")
+
+
+@functools.lru_cache(maxsize=1024)
+def sanitize_project_name(project_name: str) -> str:
+    """Convert a project name into a filesystem-safe directory name.
+
+    Args:
+        project_name: Human-readable project name
+
+    Returns:
+        Lowercase name with special characters removed and separators
+        collapsed to underscores
+    """
+    safe_name = _SANITIZE_NONWORD.sub("", project_name.lower())
+    return _SANITIZE_SEP.sub("_", safe_name)
+
+
+def _write_content(full_path: Path, content: Union[str, bytes]) -> Path:
+    """Write content to a path whose parent directory already exists."""
+    data = content if isinstance(content, bytes) else content.encode("utf-8")
+    fd = os.open(full_path, _WRITE_FLAGS, 0o666)
+    try:
+        if len(data) > _PREALLOCATE_THRESHOLD and hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, len(data))
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+    logger.info(f"Wrote file: {full_path}")
+    return full_path
+
+
+def write_files(
+    project_dir: Path, files: Mapping[str, Union[str, bytes]]
+) -> List[Path]:
+    """Write multiple files to disk concurrently.
+
+    Failures are logged and the file is left out of the result.
+
+    Args:
+        project_dir: Base project directory
+        files: Mapping of file paths to text or UTF-8 encoded bytes
+
+    Returns:
+        List of paths to written files, in the order of files
+    """
+    written_files = []
+
+    # Keys that name the same file (e.g. "src/a.py" and "./src/a.py") are
+    # collapsed into the first one's slot with the last one's content, so no
+    # two writes share a path
+    targets = {}
+    for filepath, content in files.items():
+        full_path = project_dir / os.path.normpath(filepath)
+        targets[full_path] = (filepath, content)
+
+    # Create each parent directory once, not once per file
+    parent_dirs = {full_path.parent for full_path in targets}
+    for parent_dir in parent_dirs:
+        try:
+            parent_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to create directory {parent_dir}: {e}")
+
+    # Writes now target distinct paths and release the GIL, so run them
+    # concurrently; results are collected in the original file order
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(targets)))) as pool:
+        futures = [
+            (filepath, pool.submit(_write_content, full_path, content))
+            for full_path, (filepath, content) in targets.items()
+        ]
+
+    for filepath, future in futures:
+        try:
+            written_files.append(future.result())
+        except Exception as e:
+            logger.error(f"Failed to write {filepath}: {e}")
+
+    logger.info(f"Wrote {len(written_files)} files to {project_dir}")
+    return written_files
+
 
 class CodeGenerator:
     """Handles generation and writing of code files to disk."""
 
+    # Subclasses may override this with a pattern that has the same groups
+    _code_block_re: ClassVar[re.Pattern] = _CODE_BLOCK_RE
+
     def __init__(self, base_output_dir: str = "projects"):
         """Initialize the code generator.
 
@@ -20,6 +135,7 @@ class CodeGenerator:
         """
         self.base_output_dir = Path(base_output_dir)
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
+        self._known_dirs = set()
 
     def create_project_directory(self, project_id: str, project_name: str) -> Path:
         """Create a project directory structure.
@@ -32,11 +148,14 @@ class CodeGenerator:
             Path to the created project directory
         """
         # Sanitize project name for filesystem
-        safe_name = re.sub(r"[^\w\s-]", "", project_name.lower())
-        safe_name = re.sub(r"[-\s]+", "_", safe_name)
+        safe_name = sanitize_project_name(project_name)
 
         project_dir = self.base_output_dir / f"{safe_name}_{project_id[:8]}"
-        project_dir.mkdir(parents=True, exist_ok=True)
+        # A stat is cheaper than mkdir, and catches a known directory that
+        # was removed since it was created
+        if project_dir not in self._known_dirs or not project_dir.is_dir():
+            project_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(project_dir)
 
         logger.info(f"Created project directory: {project_dir}")
         return project_dir
@@ -61,59 +180,48 @@ class CodeGenerator:
             Dictionary mapping filename to code content
         """
         files = {}
-
-        # Pattern 1: ```language:filename
-        pattern1 = r"```(?:\w+):([^\n]+)\n(.*?)```"
-        matches1 = re.finditer(pattern1, text, re.DOTALL)
-        for match in matches1:
-            filename = match.group(1).strip()
-            code = match.group(2).strip()
-            files[filename] = code
-
-        # Pattern 2: **filename** followed by code block
-        pattern2 = r"\*\*([^\*]+\.\w+)\*\*\s*```(?:\w+)?\n(.*?)```"
-        matches2 = re.finditer(pattern2, text, re.DOTALL)
-        for match in matches2:
-            filename = match.group(1).strip()
-            code = match.group(2).strip()
-            if filename not in files:  # Don't override pattern1 matches
-                files[filename] = code
-
-        # Pattern 3: Filename on its own line followed by code block
-        # Look for filename.ext at start of line (with possible whitespace), then code block
-        pattern3 = r"\n\s*([a-zA-Z0-9_\-/]+\.\w+)\s*\n\s*```(?:\w+)?\n(.*?)```"
-        matches3 = re.finditer(pattern3, text, re.DOTALL)
-        for match in matches3:
-            filename = match.group(1).strip()
-            code = match.group(2).strip()
-            if filename not in files:
+        # Pattern number that produced each filename; lower numbers win
+        sources = {}
+
+        for match in type(self)._code_block_re.finditer(text):
+            # Each alternative has two groups, so the last one matched
+            # identifies the pattern
+            pattern = match.lastindex // 2
+            filename = match.group(f"fn{pattern}").strip()
+            code = match.group(f"c{pattern}").strip()
+            # Pattern 1 always overrides; patterns 2 and 3 keep the first match
+            if pattern == 1 or pattern < sources.get(filename, 4):
                 files[filename] = code
+                sources[filename] = pattern
 
         return files
 
     def parse_file_structure(self, agent_output: Dict[str, Any]) -> Dict[str, str]:
         """Parse agent output to extract file structure.
 
+        A non-empty "files" dictionary is used as is, ignoring the other code
+        keys; otherwise every key is read in _FILE_KEYS order. Entries from
+        "basic_files" are always applied last.
+
         Args:
             agent_output: Agent response containing generated code
 
         Returns:
             Dictionary mapping file paths to content
         """
-        files = {}
-
-        # Try different keys where code might be stored
-        possible_keys = [
-            "response",
-            "generated_code",
-            "code",
-            "files",
-            "output",
-        ]
-
-        for key in possible_keys:
-            if key in agent_output:
-                content = agent_output[key]
+        structured = agent_output.get("files")
+        if (
+            isinstance(structured, dict)
+            and structured
+            and all(isinstance(v, str) for v in structured.values())
+        ):
+            # A structured file map is authoritative; the other code keys,
+            # and their code block scans, are skipped
+            files = dict(structured)
+        else:
+            files = {}
+            for key in _FILE_KEYS:
+                content = agent_output.get(key)
 
                 # If it's a dict of files, use directly
                 if isinstance(content, dict) and all(
@@ -123,8 +231,7 @@ class CodeGenerator:
 
                 # If it's a string, try to extract code blocks
                 elif isinstance(content, str):
-                    extracted = self.extract_code_blocks(content)
-                    files.update(extracted)
+                    files.update(self.extract_code_blocks(content))
 
         # Also check for fallback_code or basic_files
         if "basic_files" in agent_output:
@@ -132,13 +239,15 @@ class CodeGenerator:
 
         return files
 
-    def write_file(self, project_dir: Path, filepath: str, content: str) -> Path:
+    def write_file(
+        self, project_dir: Path, filepath: str, content: Union[str, bytes]
+    ) -> Path:
         """Write a single file to disk.
 
         Args:
             project_dir: Base project directory
             filepath: Relative path of file to write
-            content: File content
+            content: File content, as text or UTF-8 encoded bytes
 
         Returns:
             Path to the written file
@@ -148,33 +257,25 @@ class CodeGenerator:
         # Create parent directories if needed
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write the file
-        full_path.write_text(content, encoding="utf-8")
+        return self._write_text(full_path, content)
 
-        logger.info(f"Wrote file: {full_path}")
-        return full_path
+    def _write_text(self, full_path: Path, content: Union[str, bytes]) -> Path:
+        """Write content to a path whose parent directory already exists."""
+        return _write_content(full_path, content)
 
-    def write_files(self, project_dir: Path, files: Dict[str, str]) -> List[Path]:
+    def write_files(
+        self, project_dir: Path, files: Mapping[str, Union[str, bytes]]
+    ) -> List[Path]:
         """Write multiple files to disk.
 
         Args:
             project_dir: Base project directory
-            files: Dictionary mapping file paths to content
+            files: Mapping of file paths to text or UTF-8 encoded bytes
 
         Returns:
             List of paths to written files
         """
-        written_files = []
-
-        for filepath, content in files.items():
-            try:
-                written_path = self.write_file(project_dir, filepath, content)
-                written_files.append(written_path)
-            except Exception as e:
-                logger.error(f"Failed to write {filepath}: {e}")
-
-        logger.info(f"Wrote {len(written_files)} files to {project_dir}")
-        return written_files
+        return write_files(project_dir, files)
 
     def generate_project_from_agent_output(
         self, project_id: str, project_name: str, agent_outputs: Dict[str, Any]
@@ -282,7 +383,8 @@ htmlcov/
 *.log
 """.strip()
 
-        self.write_file(project_dir, ".gitignore", gitignore_content)
+        # project_dir exists (the mkdirs above would have failed otherwise)
+        self._write_text(project_dir / ".gitignore", gitignore_content)
 
         # Create basic README.md
         readme_content = f"""# Project
@@ -309,6 +411,6 @@ pip install -r requirements.txt
 pytest
 ```
 """
-        self.write_file(project_dir, "README.md", readme_content)
+        self._write_text(project_dir / "README.md", readme_content)
 
         logger.info(f"Created default project structure in {project_dir}")
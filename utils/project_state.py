@@ -1,11 +1,78 @@
 """Project state management for the multi-agent system."""
 
-import json
+import heapq
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+
+import orjson
+import zstandard
+
+# Text or bytes artifacts larger than this are kept zstd-compressed in memory
+_ARTIFACT_COMPRESS_THRESHOLD = 4096
+
+# Directories already created by save_to_file/save_delta in this process
+_KNOWN_DIRS: Set[str] = set()
+
+
+def _ensure_parent_dir(filepath: str) -> None:
+    """Create the parent directory of a file unless it is already known."""
+    directory = os.path.dirname(filepath)
+    if directory and directory not in _KNOWN_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _KNOWN_DIRS.add(directory)
+
+
+def _open_for_write(filepath: str, mode: str) -> BinaryIO:
+    """Open a file for writing, creating its parent directory as needed.
+
+    A known directory may have been removed since it was cached, so a
+    missing directory is forgotten and recreated once before giving up.
+    """
+    _ensure_parent_dir(filepath)
+    try:
+        return open(filepath, mode)
+    except FileNotFoundError:
+        _KNOWN_DIRS.discard(os.path.dirname(filepath))
+        _ensure_parent_dir(filepath)
+        return open(filepath, mode)
+
+
+def _compact_artifact(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an artifact entry with large text or bytes content compressed."""
+    content = entry.get("content")
+    if not (
+        isinstance(content, (str, bytes))
+        and len(content) > _ARTIFACT_COMPRESS_THRESHOLD
+    ):
+        return entry
+    is_text = isinstance(content, str)
+    return {
+        "compressed": zstandard.compress(
+            content.encode("utf-8") if is_text else content, 3
+        ),
+        "encoding": "zstd",
+        "text": is_text,
+        "created_at": entry.get("created_at"),
+    }
+
+
+def _expand_artifact(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an artifact entry with compressed content restored."""
+    if entry.get("encoding") != "zstd":
+        return entry
+    content = zstandard.decompress(entry["compressed"])
+    return {
+        "content": content.decode("utf-8") if entry["text"] else content,
+        "created_at": entry["created_at"],
+    }
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp written by to_dict, if there is one."""
+    return datetime.fromisoformat(value) if value else None
 
 
 class TaskStatus(Enum):
@@ -30,7 +97,7 @@ class ProjectPhase(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a development task."""
 
@@ -63,7 +130,7 @@ class Task:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectState:
     """Manages the state of a software development project."""
 
@@ -77,46 +144,202 @@ class ProjectState:
     quality_metrics: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
 
+    # Scheduling index, kept up to date by add_task and update_task_status:
+    # dependents of each task ID, the number of unfinished dependencies per
+    # task, and the ready task IDs in insertion order, each mapped to the
+    # sequence number of its live entry in the ready heap. Heap entries are
+    # (-descendant count, sequence, task ID); stale ones are skipped on pop,
+    # and the whole heap is rebuilt after new edges change descendant counts.
+    # Descendant counts are cached until then.
+    _dependents: Dict[str, List[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _unmet_count: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _ready: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _ready_heap: List[Tuple[int, int, str]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _ready_seq: int = field(default=0, init=False, repr=False, compare=False)
+    _heap_stale: bool = field(default=False, init=False, repr=False, compare=False)
+    _descendant_counts: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # Task IDs changed since the last save. Only changes made through
+    # add_task and update_task_status are tracked.
+    _dirty: Dict[str, None] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index tasks passed to the constructor."""
+        tasks, self.tasks = self.tasks, {}
+        for task in tasks.values():
+            self.add_task(task)
+
     def add_task(self, task: Task) -> None:
         """Add a task to the project."""
+        self._mark_dirty(task.id)
+        if task.id in self.tasks:
+            # Replacing a task can change any count; rebuild from scratch
+            tasks = dict(self.tasks)
+            tasks[task.id] = task
+            self._dependents.clear()
+            self._unmet_count.clear()
+            self._ready.clear()
+            self._ready_heap.clear()
+            self._heap_stale = True
+            self._descendant_counts.clear()
+            self.tasks = {}
+            for existing in tasks.values():
+                self.add_task(existing)
+            return
+
         self.tasks[task.id] = task
 
+        # Tasks added earlier may have been waiting on this one. Done before
+        # this task's own edges are added, so a self-dependency, which the
+        # loop below already counts as met, is not released a second time.
+        if task.status is TaskStatus.COMPLETED:
+            self._propagate_completion(task.id, -1)
+
+        if task.dependencies:
+            self._heap_stale = True
+            self._descendant_counts.clear()
+        unmet = 0
+        for dep_id in task.dependencies:
+            self._dependents.setdefault(dep_id, []).append(task.id)
+            dep = self.tasks.get(dep_id)
+            if dep is None or dep.status is not TaskStatus.COMPLETED:
+                unmet += 1
+        self._unmet_count[task.id] = unmet
+        self._refresh_ready(task.id)
+
     def update_task_status(
         self, task_id: str, status: TaskStatus, output: Optional[Dict[str, Any]] = None
     ) -> None:
         """Update the status of a task."""
-        if task_id in self.tasks:
-            self.tasks[task_id].status = status
-            if output:
-                self.tasks[task_id].output = output
-            if status == TaskStatus.COMPLETED:
-                self.tasks[task_id].completed_at = datetime.now()
+        task = self.tasks.get(task_id)
+        if task is None:
+            return
+
+        self._mark_dirty(task_id)
+        was_completed = task.status is TaskStatus.COMPLETED
+        is_completed = status is TaskStatus.COMPLETED
+        task.status = status
+        if output:
+            task.output = output
+        if is_completed:
+            task.completed_at = datetime.now()
+
+        if is_completed != was_completed:
+            self._propagate_completion(task_id, -1 if is_completed else 1)
+        self._refresh_ready(task_id)
+
+    def _mark_dirty(self, task_id: str) -> None:
+        """Record a task change for the next save_delta."""
+        self._dirty[task_id] = None
+
+    def _propagate_completion(self, task_id: str, delta: int) -> None:
+        """Adjust the unmet dependency counts of a task's dependents."""
+        for child_id in self._dependents.get(task_id, ()):
+            self._unmet_count[child_id] += delta
+            self._refresh_ready(child_id)
+
+    def _refresh_ready(self, task_id: str) -> None:
+        """Add a task to, or remove it from, the ready set."""
+        if (
+            self.tasks[task_id].status is TaskStatus.PENDING
+            and self._unmet_count[task_id] == 0
+        ):
+            if task_id not in self._ready:
+                self._ready_seq += 1
+                self._ready[task_id] = self._ready_seq
+                if not self._heap_stale:
+                    heapq.heappush(
+                        self._ready_heap,
+                        (-self._count_descendants(task_id), self._ready_seq, task_id),
+                    )
+        else:
+            self._ready.pop(task_id, None)
+
+    def _ready_queue(self) -> List[Tuple[int, int, str]]:
+        """Get the ready heap, rebuilding it if descendant counts changed."""
+        if self._heap_stale:
+            self._ready_heap = [
+                (-self._count_descendants(task_id), seq, task_id)
+                for task_id, seq in self._ready.items()
+            ]
+            heapq.heapify(self._ready_heap)
+            self._heap_stale = False
+        return self._ready_heap
+
+    def _count_descendants(self, task_id: str) -> int:
+        """Count the tasks that directly or transitively depend on a task."""
+        count = self._descendant_counts.get(task_id)
+        if count is not None:
+            return count
+        seen = set()
+        stack = [task_id]
+        while stack:
+            for child_id in self._dependents.get(stack.pop(), ()):
+                if child_id not in seen:
+                    seen.add(child_id)
+                    stack.append(child_id)
+        count = self._descendant_counts[task_id] = len(seen)
+        return count
 
     def get_pending_tasks(self) -> List[Task]:
         """Get all pending tasks."""
         return [
-            task for task in self.tasks.values() if task.status == TaskStatus.PENDING
+            task for task in self.tasks.values() if task.status is TaskStatus.PENDING
         ]
 
     def get_ready_tasks(self) -> List[Task]:
         """Get tasks that are ready to execute (dependencies satisfied)."""
-        ready_tasks = []
-        for task in self.get_pending_tasks():
-            dependencies_satisfied = all(
-                self.tasks.get(dep_id, Task("", "", "", "")).status
-                == TaskStatus.COMPLETED
-                for dep_id in task.dependencies
-            )
-            if dependencies_satisfied:
-                ready_tasks.append(task)
-        return ready_tasks
+        return [self.tasks[task_id] for task_id in self._ready]
+
+    def peek_ready(self) -> Optional[Task]:
+        """Get the highest-priority ready task without taking it."""
+        heap = self._ready_queue()
+        while heap and self._ready.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return self.tasks[heap[0][2]] if heap else None
+
+    def pop_ready(self) -> Optional[Task]:
+        """Take the ready task with the most dependent tasks.
+
+        Ties go to the task that became ready first. The task leaves the
+        ready set until its status or dependencies change again.
+        """
+        heap = self._ready_queue()
+        while heap:
+            _, seq, task_id = heapq.heappop(heap)
+            if self._ready.get(task_id) == seq:
+                del self._ready[task_id]
+                return self.tasks[task_id]
+        return None
 
     def add_artifact(self, name: str, content: Any) -> None:
-        """Add an artifact to the project."""
-        self.artifacts[name] = {
-            "content": content,
-            "created_at": datetime.now().isoformat(),
-        }
+        """Add an artifact to the project.
+
+        Large string and bytes contents are stored compressed; use
+        get_artifact to read them back.
+        """
+        self.artifacts[name] = _compact_artifact(
+            {"content": content, "created_at": datetime.now().isoformat()}
+        )
+
+    def get_artifact(self, name: str) -> Any:
+        """Get an artifact's content, decompressing it if needed."""
+        entry = self.artifacts.get(name)
+        if entry is None:
+            return None
+        return _expand_artifact(entry)["content"]
 
     def update_quality_metrics(self, metrics: Dict[str, Any]) -> None:
         """Update quality metrics."""
@@ -131,22 +354,34 @@ class ProjectState:
             "architecture": self.architecture,
             "tasks": {k: v.to_dict() for k, v in self.tasks.items()},
             "phase": self.phase.value,
-            "artifacts": self.artifacts,
+            "artifacts": {k: _expand_artifact(v) for k, v in self.artifacts.items()},
             "quality_metrics": self.quality_metrics,
             "created_at": self.created_at.isoformat(),
         }
 
     def save_to_file(self, filepath: str) -> None:
         """Save project state to a JSON file."""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        with _open_for_write(filepath, "wb") as f:
+            f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        self._dirty.clear()
+
+    def save_delta(self, filepath: str) -> None:
+        """Append tasks changed since the last save to a JSON Lines file."""
+        if not self._dirty:
+            return
+        with _open_for_write(filepath, "ab") as f:
+            for task_id in self._dirty:
+                task = self.tasks.get(task_id)
+                if task is not None:
+                    record = {"task_id": task_id, "fields": task.to_dict()}
+                    f.write(orjson.dumps(record) + b"\n")
+        self._dirty.clear()
 
     @classmethod
     def load_from_file(cls, filepath: str) -> "ProjectState":
         """Load project state from a JSON file."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = orjson.loads(f.read())
 
         # Reconstruct the project state
         state = cls(
@@ -155,8 +390,9 @@ class ProjectState:
             requirements=data["requirements"],
             architecture=data["architecture"],
             phase=ProjectPhase(data["phase"]),
-            artifacts=data["artifacts"],
+            artifacts={k: _compact_artifact(v) for k, v in data["artifacts"].items()},
             quality_metrics=data["quality_metrics"],
+            created_at=_parse_datetime(data.get("created_at")) or datetime.now(),
         )
 
         # Reconstruct tasks
@@ -168,9 +404,14 @@ class ProjectState:
                 assigned_to=task_data["assigned_to"],
                 status=TaskStatus(task_data["status"]),
                 dependencies=task_data["dependencies"],
+                created_at=(
+                    _parse_datetime(task_data.get("created_at")) or datetime.now()
+                ),
+                completed_at=_parse_datetime(task_data.get("completed_at")),
                 output=task_data.get("output"),
                 error=task_data.get("error"),
             )
-            state.tasks[task_id] = task
+            state.add_task(task)
 
+        state._dirty.clear()
         return state
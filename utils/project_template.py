@@ -1,105 +1,19 @@
 """Project template generator for creating deployable applications."""
 
+import collections
+import functools
 import logging
-import os
+import re
 from pathlib import Path
-from typing import Any, Dict, List
-
-logger = logging.getLogger(__name__)
-
-
-class ProjectTemplate:
-    """Generates complete project templates with all necessary files."""
-
-    @staticmethod
-    def generate_fastapi_project(
-        project_name: str, description: str, features: List[str] = None
-    ) -> Dict[str, str]:
-        """Generate a complete FastAPI project template.
-
-        Args:
-            project_name: Project name
-            description: Project description
-            features: List of features to include
-
-        Returns:
-            Dictionary mapping file paths to content
-        """
-        safe_name = project_name.lower().replace(" ", "_").replace("-", "_")
-        features = features or []
-
-        files = {}
-
-        # Main application file
-        files[
-            "main.py"
-        ] = f'''"""
-{description}
-"""
+from types import MappingProxyType
+from typing import ChainMap, Dict, Iterator, List, Mapping, Sequence, Tuple
 
-import logging
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from utils.code_generator import write_files
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI
-app = FastAPI(
-    title="{project_name}",
-    description="{description}",
-    version="1.0.0",
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# Models
-class HealthResponse(BaseModel):
-    status: str
-    message: str
-
-
-# Routes
-@app.get("/", response_model=HealthResponse)
-async def root():
-    """Root endpoint."""
-    return HealthResponse(
-        status="success",
-        message="{project_name} is running"
-    )
-
-
-@app.get("/health", response_model=HealthResponse)
-async def health():
-    """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        message="Service is operational"
-    )
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
-'''
-
-        # Requirements.txt
-        files[
-            "requirements.txt"
-        ] = """fastapi==0.115.6
+# File contents that do not depend on the project, built once at import
+_REQUIREMENTS_TXT = """fastapi==0.115.6
 uvicorn[standard]==0.34.0
 pydantic==2.10.4
 python-dotenv==1.0.1
@@ -107,10 +21,7 @@ pytest==8.3.4
 httpx==0.28.1
 """
 
-        # Dockerfile
-        files[
-            "Dockerfile"
-        ] = f"""FROM python:3.11-slim
+_DOCKERFILE = """FROM python:3.11-slim
 
 WORKDIR /app
 
@@ -128,98 +39,29 @@ EXPOSE 8000
 CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
 """
 
-        # .dockerignore
-        files[
-            ".dockerignore"
-        ] = """__pycache__
-*.pyc
-*.pyo
-*.pyd
-.Python
+# Python environment entries shared by .dockerignore and .gitignore
+_PY_IGNORE_COMMON = """.Python
 env/
 venv/
 .venv/
-.pytest_cache/
+"""
+
+_DOCKERIGNORE = (
+    """__pycache__
+*.pyc
+*.pyo
+*.pyd
+"""
+    + _PY_IGNORE_COMMON
+    + """.pytest_cache/
 .git/
 .gitignore
 README.md
 tests/
 """
+)
 
-        # README.md
-        default_features = "- RESTful API\n- Health check endpoint"
-        features_text = (
-            chr(10).join(f"- {feature}" for feature in features)
-            if features
-            else default_features
-        )
-        files[
-            "README.md"
-        ] = f"""# {project_name}
-
-{description}
-
-## Features
-
-{features_text}
-
-## Installation
-
-```bash
-# Create virtual environment
-python -m venv venv
-source venv/bin/activate  # On Windows: venv\\Scripts\\activate
-
-# Install dependencies
-pip install -r requirements.txt
-```
-
-## Running Locally
-
-```bash
-python main.py
-```
-
-The API will be available at http://localhost:8000
-
-## API Documentation
-
-Once running, visit:
-- Swagger UI: http://localhost:8000/docs
-- ReDoc: http://localhost:8000/redoc
-
-## Running Tests
-
-```bash
-pytest tests/
-```
-
-## Docker
-
-```bash
-# Build image
-docker build -t {safe_name} .
-
-# Run container
-docker run -p 8000:8000 {safe_name}
-```
-
-## Deployment
-
-This application is ready to deploy to:
-- AWS ECS/Fargate
-- Google Cloud Run
-- Azure Container Apps
-- Kubernetes
-
-See deployment/ directory for configuration files.
-"""
-
-        # Test file
-        files["tests/__init__.py"] = ""
-        files[
-            "tests/test_main.py"
-        ] = '''"""Tests for main application."""
+_TEST_MAIN_PY = '''"""Tests for main application."""
 
 import pytest
 from fastapi.testclient import TestClient
@@ -245,80 +87,20 @@ def test_health():
     assert data["status"] == "healthy"
 '''
 
-        # GitHub Actions workflow
-        files[
-            ".github/workflows/ci-cd.yml"
-        ] = f"""name: CI/CD
-
-on:
-  push:
-    branches: [ main ]
-  pull_request:
-    branches: [ main ]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-
-    steps:
-    - uses: actions/checkout@v4
-
-    - name: Set up Python
-      uses: actions/setup-python@v4
-      with:
-        python-version: '3.11'
-
-    - name: Install dependencies
-      run: |
-        python -m pip install --upgrade pip
-        pip install -r requirements.txt
-
-    - name: Run tests
-      run: |
-        pytest tests/ -v --tb=short
-
-    - name: Run linting
-      run: |
-        pip install black flake8
-        black --check .
-        flake8 . --max-line-length=100
-
-  build-and-deploy:
-    needs: test
-    runs-on: ubuntu-latest
-    if: github.ref == 'refs/heads/main'
-
-    steps:
-    - uses: actions/checkout@v4
-
-    - name: Build Docker image
-      run: |
-        docker build -t {safe_name}:latest .
-
-    # Add deployment steps here based on target platform
-"""
-
-        # .env.example
-        files[
-            ".env.example"
-        ] = """# Environment variables
+_ENV_EXAMPLE = """# Environment variables
 DEBUG=False
 LOG_LEVEL=INFO
 """
 
-        # .gitignore
-        files[
-            ".gitignore"
-        ] = """# Python
+_GITIGNORE = (
+    """# Python
 __pycache__/
 *.py[cod]
 *$py.class
 *.so
-.Python
-env/
-venv/
-.venv/
-ENV/
+"""
+    + _PY_IGNORE_COMMON
+    + """ENV/
 build/
 develop-eggs/
 dist/
@@ -355,39 +137,24 @@ htmlcov/
 .DS_Store
 Thumbs.db
 """
+)
 
-        return files
-
-    @staticmethod
-    def add_database_support(
-        files: Dict[str, str], db_type: str = "sqlite"
-    ) -> Dict[str, str]:
-        """Add database support to project files.
-
-        Args:
-            files: Existing project files
-            db_type: Database type (sqlite, postgresql, mysql)
-
-        Returns:
-            Updated files dictionary
-        """
-        # Add database dependencies to requirements.txt
-        if "requirements.txt" in files:
-            files[
-                "requirements.txt"
-            ] += f"""
-sqlalchemy==2.0.43
-alembic==1.14.0
-"""
-            if db_type == "postgresql":
-                files["requirements.txt"] += "psycopg2-binary==2.9.10\n"
-            elif db_type == "mysql":
-                files["requirements.txt"] += "pymysql==1.1.1\n"
-
-        # Add database module
-        files[
-            "database.py"
-        ] = f'''"""Database configuration."""
+# Generated files are UTF-8 bytes, so static contents are encoded only once
+_STATIC_FILES = {
+    path: content.encode("utf-8")
+    for path, content in {
+        "requirements.txt": _REQUIREMENTS_TXT,
+        "Dockerfile": _DOCKERFILE,
+        ".dockerignore": _DOCKERIGNORE,
+        "tests/__init__.py": "",
+        "tests/test_main.py": _TEST_MAIN_PY,
+        ".env.example": _ENV_EXAMPLE,
+        ".gitignore": _GITIGNORE,
+    }.items()
+}
+
+# Modules added by add_database_support and add_authentication
+_DATABASE_PY = '''"""Database configuration."""
 
 import os
 from sqlalchemy import create_engine
@@ -398,7 +165,9 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={{"check_same_thread": False}} if DATABASE_URL.startswith("sqlite") else {{}}
+    connect_args={"check_same_thread": False}
+    if DATABASE_URL.startswith("sqlite")
+    else {},
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -415,10 +184,7 @@ def get_db():
         db.close()
 '''
 
-        # Add models example
-        files[
-            "models.py"
-        ] = '''"""Database models."""
+_MODELS_PY = '''"""Database models."""
 
 from sqlalchemy import Column, Integer, String, DateTime
 from datetime import datetime
@@ -436,31 +202,7 @@ class Item(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 '''
 
-        return files
-
-    @staticmethod
-    def add_authentication(files: Dict[str, str]) -> Dict[str, str]:
-        """Add JWT authentication to project.
-
-        Args:
-            files: Existing project files
-
-        Returns:
-            Updated files dictionary
-        """
-        # Add auth dependencies
-        if "requirements.txt" in files:
-            files[
-                "requirements.txt"
-            ] += """python-jose[cryptography]==3.3.0
-passlib[bcrypt]==1.7.4
-python-multipart==0.0.20
-"""
-
-        # Add auth module
-        files[
-            "auth.py"
-        ] = '''"""Authentication and authorization."""
+_AUTH_PY = '''"""Authentication and authorization."""
 
 from datetime import datetime, timedelta
 from typing import Optional
@@ -531,4 +273,453 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     return token_data
 '''
 
-        return files
+_DATABASE_FILES = {
+    "database.py": _DATABASE_PY.encode("utf-8"),
+    "models.py": _MODELS_PY.encode("utf-8"),
+}
+# requirements.txt addendum for each supported database type
+_SQLALCHEMY_REQUIREMENTS = b"\nsqlalchemy==2.0.43\nalembic==1.14.0\n"
+_DB_REQUIREMENTS = {
+    "sqlite": _SQLALCHEMY_REQUIREMENTS,
+    "postgresql": _SQLALCHEMY_REQUIREMENTS + b"psycopg2-binary==2.9.10\n",
+    "mysql": _SQLALCHEMY_REQUIREMENTS + b"pymysql==1.1.1\n",
+}
+_AUTH_FILES = {"auth.py": _AUTH_PY.encode("utf-8")}
+_AUTH_REQUIREMENTS = b"""python-jose[cryptography]==3.3.0
+passlib[bcrypt]==1.7.4
+python-multipart==0.0.20
+"""
+
+# Maps spaces and hyphens to underscores when deriving the image name
+_SAFE_NAME_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+# README feature list used when no features are given
+_DEFAULT_FEATURES_TEXT = "- RESTful API\n- Health check endpoint"
+
+# ${name} placeholders in the dynamic file templates
+_PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+
+def _compile_template(template: str) -> bytes:
+    """Encode a template, turning each ${name} into a NUL-delimited sentinel."""
+    return _PLACEHOLDER.sub("\x00\\1\x00", template).encode("utf-8")
+
+
+def _render(template: bytes, **values: str) -> bytes:
+    """Fill a compiled template with bytes.replace, one placeholder at a time.
+
+    NUL characters are rejected so a value can never contain a sentinel.
+    """
+    for name, value in values.items():
+        if "\x00" in value:
+            raise ValueError(f"{name} must not contain NUL characters")
+        template = template.replace(f"\x00{name}\x00".encode(), value.encode("utf-8"))
+    return template
+
+
+# Templates for the files that depend on the project inputs, compiled to
+# bytes once at import
+_MAIN_PY_TEMPLATE = _compile_template(
+    '''"""
+${description}
+"""
+
+import logging
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Initialize FastAPI
+app = FastAPI(
+    title="${project_name}",
+    description="${description}",
+    version="1.0.0",
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+# Models
+class HealthResponse(BaseModel):
+    status: str
+    message: str
+
+
+# Routes
+@app.get("/", response_model=HealthResponse)
+async def root():
+    """Root endpoint."""
+    return HealthResponse(
+        status="success",
+        message="${project_name} is running"
+    )
+
+
+@app.get("/health", response_model=HealthResponse)
+async def health():
+    """Health check endpoint."""
+    return HealthResponse(
+        status="healthy",
+        message="Service is operational"
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
+'''
+)
+
+_README_TEMPLATE = _compile_template(
+    """# ${project_name}
+
+${description}
+
+## Features
+
+${features_text}
+
+## Installation
+
+```bash
+# Create virtual environment
+python -m venv venv
+source venv/bin/activate  # On Windows: venv\\Scripts\\activate
+
+# Install dependencies
+pip install -r requirements.txt
+```
+
+## Running Locally
+
+```bash
+python main.py
+```
+
+The API will be available at http://localhost:8000
+
+## API Documentation
+
+Once running, visit:
+- Swagger UI: http://localhost:8000/docs
+- ReDoc: http://localhost:8000/redoc
+
+## Running Tests
+
+```bash
+pytest tests/
+```
+
+## Docker
+
+```bash
+# Build image
+docker build -t ${safe_name} .
+
+# Run container
+docker run -p 8000:8000 ${safe_name}
+```
+
+## Deployment
+
+This application is ready to deploy to:
+- AWS ECS/Fargate
+- Google Cloud Run
+- Azure Container Apps
+- Kubernetes
+
+See deployment/ directory for configuration files.
+"""
+)
+
+_CI_CD_TEMPLATE = _compile_template(
+    """name: CI/CD
+
+on:
+  push:
+    branches: [ main ]
+  pull_request:
+    branches: [ main ]
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+
+    steps:
+    - uses: actions/checkout@v4
+
+    - name: Set up Python
+      uses: actions/setup-python@v4
+      with:
+        python-version: '3.11'
+
+    - name: Install dependencies
+      run: |
+        python -m pip install --upgrade pip
+        pip install -r requirements.txt
+
+    - name: Run tests
+      run: |
+        pytest tests/ -v --tb=short
+
+    - name: Run linting
+      run: |
+        pip install black flake8
+        black --check .
+        flake8 . --max-line-length=100
+
+  build-and-deploy:
+    needs: test
+    runs-on: ubuntu-latest
+    if: github.ref == 'refs/heads/main'
+
+    steps:
+    - uses: actions/checkout@v4
+
+    - name: Build Docker image
+      run: |
+        docker build -t ${safe_name}:latest .
+
+    # Add deployment steps here based on target platform
+"""
+)
+
+
+def iter_fastapi_project(
+    project_name: str, description: str, features: Sequence[str] = ()
+) -> Iterator[Tuple[str, bytes]]:
+    """Generate a FastAPI project template one file at a time.
+
+    Args:
+        project_name: Project name
+        description: Project description
+        features: List of features to include
+
+    Yields:
+        Tuples of file path and UTF-8 encoded content
+    """
+    safe_name = project_name.translate(_SAFE_NAME_TABLE).lower()
+
+    # Main application file
+    yield "main.py", _render(
+        _MAIN_PY_TEMPLATE, project_name=project_name, description=description
+    )
+
+    yield from _STATIC_FILES.items()
+
+    # README.md
+    features_text = (
+        "\n".join(f"- {feature}" for feature in features)
+        if features
+        else _DEFAULT_FEATURES_TEXT
+    )
+    yield "README.md", _render(
+        _README_TEMPLATE,
+        project_name=project_name,
+        description=description,
+        features_text=features_text,
+        safe_name=safe_name,
+    )
+
+    # GitHub Actions workflow
+    yield ".github/workflows/ci-cd.yml", _render(_CI_CD_TEMPLATE, safe_name=safe_name)
+
+
+@functools.lru_cache(maxsize=32)
+def _generate_fastapi_project_cached(
+    project_name: str, description: str, features: Tuple[str, ...]
+) -> Mapping[str, bytes]:
+    """Generate a project once per distinct set of inputs.
+
+    The result is read-only because it is shared between callers.
+    """
+    return MappingProxyType(
+        dict(iter_fastapi_project(project_name, description, features))
+    )
+
+
+def generate_fastapi_project(
+    project_name: str, description: str, features: Sequence[str] = ()
+) -> Mapping[str, bytes]:
+    """Generate a complete FastAPI project template.
+
+    Args:
+        project_name: Project name
+        description: Project description
+        features: List of features to include
+
+    Returns:
+        Read-only mapping of file paths to UTF-8 encoded content, shared
+        between callers; layer changes with the add_* functions
+    """
+    features = tuple(features or ())
+    return _generate_fastapi_project_cached(project_name, description, features)
+
+
+def write_fastapi_project(
+    dest: Path, project_name: str, description: str, features: Sequence[str] = ()
+) -> List[Path]:
+    """Write a FastAPI project template to disk as it is generated.
+
+    Args:
+        dest: Directory to write the project into
+        project_name: Project name
+        description: Project description
+        features: List of features to include
+
+    Returns:
+        List of paths to written files
+    """
+    written_files = []
+    for filepath, content in iter_fastapi_project(project_name, description, features):
+        full_path = dest / filepath
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(content)
+        written_files.append(full_path)
+
+    logger.info(f"Wrote {len(written_files)} template files to {dest}")
+    return written_files
+
+
+def write_project(files: Mapping[str, bytes], dest: Path) -> List[Path]:
+    """Write generated project files to disk concurrently.
+
+    Args:
+        files: Mapping of file paths to UTF-8 encoded content
+        dest: Directory to write the project into
+
+    Returns:
+        List of paths to written files, in the order of files; files that
+        fail to write are logged and left out
+    """
+    return write_files(dest, files)
+
+
+def _layer(
+    files: Mapping[str, bytes], overlays: Dict[str, bytes]
+) -> ChainMap[str, bytes]:
+    """Put overlays on top of files without copying the files below them."""
+    if isinstance(files, collections.ChainMap):
+        return files.new_child(overlays)
+    return collections.ChainMap(overlays, files)
+
+
+def add_database_support(
+    files: Mapping[str, bytes], db_type: str = "sqlite"
+) -> ChainMap[str, bytes]:
+    """Add database support to project files.
+
+    Args:
+        files: Existing project files, left unchanged
+        db_type: Database type (sqlite, postgresql, mysql)
+
+    Returns:
+        Layered view of the files with the database changes on top
+
+    Raises:
+        ValueError: If db_type is not a supported database
+    """
+    db_requirements = _DB_REQUIREMENTS.get(db_type)
+    if db_requirements is None:
+        raise ValueError(f"Unsupported database type: {db_type}")
+
+    overlays = dict(_DATABASE_FILES)
+
+    # Add database dependencies to requirements.txt
+    requirements = files.get("requirements.txt")
+    if requirements is not None:
+        overlays["requirements.txt"] = requirements + db_requirements
+
+    return _layer(files, overlays)
+
+
+def add_authentication(files: Mapping[str, bytes]) -> ChainMap[str, bytes]:
+    """Add JWT authentication to project.
+
+    Args:
+        files: Existing project files, left unchanged
+
+    Returns:
+        Layered view of the files with the auth changes on top
+    """
+    overlays = dict(_AUTH_FILES)
+
+    # Add auth dependencies
+    requirements = files.get("requirements.txt")
+    if requirements is not None:
+        overlays["requirements.txt"] = requirements + _AUTH_REQUIREMENTS
+
+    return _layer(files, overlays)
+
+
+def finalize(files: Mapping[str, bytes]) -> Dict[str, bytes]:
+    """Flatten a generated or layered file mapping into a plain dictionary.
+
+    Args:
+        files: Project files from generate_fastapi_project or the add_* functions
+
+    Returns:
+        Dictionary mapping file paths to UTF-8 encoded content
+    """
+    return dict(files)
+
+
+def _decode_into(
+    files: Dict[str, str], overlays: Mapping[str, bytes]
+) -> Dict[str, str]:
+    """Store overlays in files as text, replacing existing entries."""
+    for filepath, content in overlays.items():
+        files[filepath] = content.decode("utf-8")
+    return files
+
+
+def _requirements_only(files: Mapping[str, str]) -> Dict[str, bytes]:
+    """Encode just the requirements file, the only one the add_* functions read."""
+    if "requirements.txt" not in files:
+        return {}
+    return {"requirements.txt": files["requirements.txt"].encode("utf-8")}
+
+
+class ProjectTemplate:
+    """Adapter keeping the former static methods' text-based, mutating API.
+
+    Deprecated: use the module-level functions instead, which return UTF-8
+    encoded bytes and layer changes instead of mutating their input.
+    """
+
+    @staticmethod
+    def generate_fastapi_project(
+        project_name: str, description: str, features: Sequence[str] = ()
+    ) -> Dict[str, str]:
+        """Generate a project as a new, mutable dictionary of text files."""
+        return _decode_into(
+            {}, generate_fastapi_project(project_name, description, features)
+        )
+
+    @staticmethod
+    def add_database_support(
+        files: Dict[str, str], db_type: str = "sqlite"
+    ) -> Dict[str, str]:
+        """Add database support to files in place and return them."""
+        layered = add_database_support(_requirements_only(files), db_type)
+        return _decode_into(files, layered.maps[0])
+
+    @staticmethod
+    def add_authentication(files: Dict[str, str]) -> Dict[str, str]:
+        """Add JWT authentication to files in place and return them."""
+        layered = add_authentication(_requirements_only(files))
+        return _decode_into(files, layered.maps[0])